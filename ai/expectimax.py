@@ -0,0 +1,223 @@
+import time
+from collections import OrderedDict
+from models.bitboard import ROW_MASK, MOVES, count_empty, transpose, to_board
+
+# Heuristic weights for a single row or column (see _build_heuristic_table)
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+# Chance branches less likely than this are evaluated heuristically
+PROBABILITY_CUTOFF = 0.0001
+
+HEURISTIC = [0.0] * 65536
+
+
+def _build_heuristic_table():
+    """Score every possible row by empty cells, merge potential and monotonicity"""
+    for row in range(65536):
+        line = [(row >> 4 * i) & 0xF for i in range(4)]
+
+        empty = 0
+        merges = 0
+        previous = 0
+        counter = 0
+        total = 0.0
+        for rank in line:
+            total += rank ** SUM_POWER
+            if rank == 0:
+                empty += 1
+            else:
+                # Count runs of equal tiles that could merge
+                if previous == rank:
+                    counter += 1
+                elif counter > 0:
+                    merges += 1 + counter
+                    counter = 0
+                previous = rank
+        if counter > 0:
+            merges += 1 + counter
+
+        # Penalise the row for not being monotonic in either direction
+        monotonicity_left = 0.0
+        monotonicity_right = 0.0
+        for i in range(1, 4):
+            if line[i - 1] > line[i]:
+                monotonicity_left += line[i - 1] ** MONOTONICITY_POWER - line[i] ** MONOTONICITY_POWER
+            else:
+                monotonicity_right += line[i] ** MONOTONICITY_POWER - line[i - 1] ** MONOTONICITY_POWER
+
+        HEURISTIC[row] = (
+            LOST_PENALTY
+            + EMPTY_WEIGHT * empty
+            + MERGES_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * min(monotonicity_left, monotonicity_right)
+            - SUM_WEIGHT * total
+        )
+
+
+_build_heuristic_table()
+
+
+def evaluate(board):
+    """Heuristic value of a board, summed over its rows and columns"""
+    t = transpose(board)
+    return (
+        HEURISTIC[board & ROW_MASK]
+        + HEURISTIC[(board >> 16) & ROW_MASK]
+        + HEURISTIC[(board >> 32) & ROW_MASK]
+        + HEURISTIC[board >> 48]
+        + HEURISTIC[t & ROW_MASK]
+        + HEURISTIC[(t >> 16) & ROW_MASK]
+        + HEURISTIC[(t >> 32) & ROW_MASK]
+        + HEURISTIC[t >> 48]
+    )
+
+
+class ExpectimaxPlayer:
+    """Depth-limited expectimax over move and tile-spawn chance nodes.
+
+    Search deepens one move at a time until the adaptive depth limit for the
+    position is reached or the per-move time budget runs out. Chance-node
+    values are kept in a bounded transposition table keyed on the packed
+    board, evicting the least recently used entries.
+    """
+
+    def __init__(self, time_budget=0.1, max_depth=None, cache_size=200000):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # board -> (depth, value)
+        self.nodes = 0
+        self.cache_lookups = 0
+        self.cache_hits = 0
+        self.search_time = 0.0
+        self.moves = 0
+        self.last_depth = 0
+
+    def depth_limit(self, board):
+        """Search deeper when the board is crowded and moves matter more"""
+        if self.max_depth is not None:
+            return self.max_depth
+        empty = count_empty(board)
+        if empty >= 8:
+            return 1
+        if empty >= 4:
+            return 2
+        return 3
+
+    def best_move(self, grid):
+        """Return the best direction for a grid, or None if no move is left"""
+        board = to_board(grid)
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget else None
+
+        best = None
+        previous_pass = 0.0
+        for depth in range(1, self.depth_limit(board) + 1):
+            depth_start = time.perf_counter()
+            best_value = -1.0
+            best_at_depth = None
+            for direction, move in MOVES.items():
+                new_board, _ = move(board)
+                if new_board == board:
+                    continue
+                value = self._chance_node(new_board, depth, 1.0)
+                if value > best_value:
+                    best_value = value
+                    best_at_depth = direction
+            if best_at_depth is None:
+                break
+            best = best_at_depth
+            self.last_depth = depth
+            # Stop if the next, deeper pass is unlikely to finish in time,
+            # assuming it grows by as much as this pass did over the last one
+            now = time.perf_counter()
+            this_pass = now - depth_start
+            growth = this_pass / previous_pass if previous_pass else 10.0
+            if deadline is not None and now + this_pass * growth >= deadline:
+                break
+            previous_pass = this_pass
+
+        self.search_time += time.perf_counter() - start
+        self.moves += 1
+        return best
+
+    def choose_move(self, game_grid):
+        """Autoplay hook used by GameController"""
+        return self.best_move(game_grid)
+
+    def close(self):
+        """Nothing to release; present for the autoplayer interface"""
+
+    def _max_node(self, board, depth, probability):
+        self.nodes += 1
+        best = 0.0
+        for move in MOVES.values():
+            new_board, _ = move(board)
+            if new_board != board:
+                value = self._chance_node(new_board, depth, probability)
+                if value > best:
+                    best = value
+        return best
+
+    def _chance_node(self, board, depth, probability):
+        self.nodes += 1
+        if depth <= 0 or probability < PROBABILITY_CUTOFF:
+            return evaluate(board)
+
+        cache = self.cache
+        self.cache_lookups += 1
+        entry = cache.get(board)
+        if entry is not None and entry[0] >= depth:
+            self.cache_hits += 1
+            cache.move_to_end(board)
+            return entry[1]
+
+        empty = count_empty(board)
+        two_probability = probability * 0.9 / empty
+        four_probability = probability * 0.1 / empty
+        total = 0.0
+        shift = 0
+        while shift < 64:
+            if not (board >> shift) & 0xF:
+                total += 0.9 * self._max_node(board | (1 << shift), depth - 1, two_probability)
+                total += 0.1 * self._max_node(board | (2 << shift), depth - 1, four_probability)
+            shift += 4
+        value = total / empty
+
+        cache[board] = (depth, value)
+        cache.move_to_end(board)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Search statistics accumulated since the player was created"""
+        return {
+            "moves": self.moves,
+            "nodes": self.nodes,
+            "nodes_per_sec": self.nodes / self.search_time if self.search_time else 0.0,
+            "cache_hit_rate": self.cache_hits / self.cache_lookups if self.cache_lookups else 0.0,
+            "cache_entries": len(self.cache),
+            "last_depth": self.last_depth,
+            "avg_move_time": self.search_time / self.moves if self.moves else 0.0,
+        }
+
+    def report(self):
+        """One-line summary of the search statistics"""
+        stats = self.stats()
+        return (
+            f"expectimax: {stats['moves']} moves, {stats['nodes_per_sec']:.0f} nodes/sec, "
+            f"cache hit rate {stats['cache_hit_rate']:.1%} ({stats['cache_entries']} entries), "
+            f"{stats['avg_move_time'] * 1000:.1f} ms/move, last depth {stats['last_depth']}"
+        )
+
+
+def best_move(grid, **options):
+    """Headless helper: return the best direction for a 4x4 grid"""
+    return ExpectimaxPlayer(**options).best_move(grid)
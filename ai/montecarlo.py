@@ -0,0 +1,131 @@
+import os
+import random
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from models.bitboard import MOVES, spawn, to_board
+
+DIRECTION_ORDER = tuple(MOVES)
+MOVE_FUNCTIONS = tuple(MOVES.values())
+
+
+def play_rollouts(board, rollouts, seed, max_moves=0):
+    """Play random games from a board that is waiting for its spawn.
+
+    Returns the total score gained over all rollouts. Boards travel to and
+    from worker processes as plain integers, so nothing larger than a few
+    ints is pickled per task.
+    """
+    rng = random.Random(seed)
+    moves = list(MOVE_FUNCTIONS)
+    total = 0
+    for _ in range(rollouts):
+        current = board
+        played = 0
+        while True:
+            current = spawn(current, rng)
+            rng.shuffle(moves)
+            for move in moves:
+                new_board, gained = move(current)
+                if new_board != current:
+                    break
+            else:
+                break  # No legal move left
+            current = new_board
+            total += gained
+            played += 1
+            if max_moves and played >= max_moves:
+                break
+    return total
+
+
+class MonteCarloPlayer:
+    """Picks the move whose random playouts score best on average.
+
+    Rollouts for the four candidate moves are split into chunks and spread
+    over a persistent process pool, so throughput scales with cores. With a
+    single worker the rollouts run in-process.
+    """
+
+    def __init__(self, rollouts=200, workers=None, max_moves=0, seed=None):
+        self.rollouts = rollouts
+        self.workers = workers or os.cpu_count() or 1
+        self.max_moves = max_moves
+        self.rng = random.Random(seed)
+        self.executor = None
+        self.moves = 0
+        self.total_rollouts = 0
+        self.search_time = 0.0
+
+    def _pool(self):
+        if self.executor is None:
+            # Spawned workers do not inherit pygame/SDL state from the game
+            context = multiprocessing.get_context("spawn")
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self.executor
+
+    def best_move(self, grid, rollouts=None):
+        """Return the best direction for a 4x4 grid, or None if no move is left"""
+        board = to_board(grid)
+        rollouts = rollouts or self.rollouts
+        start = time.perf_counter()
+
+        candidates = []
+        for direction, move in zip(DIRECTION_ORDER, MOVE_FUNCTIONS):
+            new_board, gained = move(board)
+            if new_board != board:
+                candidates.append((direction, new_board, gained))
+        if not candidates:
+            return None
+
+        # Split each candidate's rollouts into one chunk per worker
+        chunks = min(self.workers, rollouts)
+        sizes = [rollouts // chunks + (1 if i < rollouts % chunks else 0) for i in range(chunks)]
+        totals = {}
+        if self.workers == 1:
+            for direction, new_board, gained in candidates:
+                totals[direction] = play_rollouts(new_board, rollouts, self.rng.getrandbits(64), self.max_moves)
+        else:
+            pool = self._pool()
+            futures = []
+            for direction, new_board, gained in candidates:
+                for size in sizes:
+                    seed = self.rng.getrandbits(64)
+                    futures.append((direction, pool.submit(play_rollouts, new_board, size, seed, self.max_moves)))
+            for direction, future in futures:
+                totals[direction] = totals.get(direction, 0) + future.result()
+
+        best = max(candidates, key=lambda candidate: candidate[2] + totals[candidate[0]] / rollouts)[0]
+
+        self.search_time += time.perf_counter() - start
+        self.moves += 1
+        self.total_rollouts += rollouts * len(candidates)
+        return best
+
+    def choose_move(self, game_grid):
+        """Autoplay hook used by GameController"""
+        return self.best_move(game_grid)
+
+    def close(self):
+        """Shut the worker pool down"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def stats(self):
+        """Rollout statistics accumulated since the player was created"""
+        return {
+            "moves": self.moves,
+            "rollouts": self.total_rollouts,
+            "rollouts_per_sec": self.total_rollouts / self.search_time if self.search_time else 0.0,
+            "avg_move_time": self.search_time / self.moves if self.moves else 0.0,
+            "workers": self.workers,
+        }
+
+    def report(self):
+        """One-line summary of the rollout statistics"""
+        stats = self.stats()
+        return (
+            f"montecarlo: {stats['moves']} moves, {stats['rollouts_per_sec']:.0f} rollouts/sec "
+            f"on {stats['workers']} workers, {stats['avg_move_time'] * 1000:.1f} ms/move"
+        )
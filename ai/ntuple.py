@@ -0,0 +1,251 @@
+import os
+import sys
+import mmap
+import time
+import random
+import struct
+import argparse
+from models.bitboard import MOVES, max_rank, spawn, to_board
+from utils.config import NTUPLE_WEIGHTS
+
+# Default n-tuple patterns, as nibble indices (4*row + col) on the 4x4 board
+DEFAULT_PATTERNS = (
+    (0, 1, 2, 3, 4, 5),
+    (4, 5, 6, 7, 8, 9),
+    (0, 1, 2, 4, 5, 6),
+    (4, 5, 6, 8, 9, 10),
+)
+
+# Weight file layout: a 64-byte header (magic, pattern count, tuple length,
+# pattern cells) followed by one float32 table of 16**length entries per pattern
+MAGIC = b"NTUPLE01"
+HEADER_SIZE = 64
+HEADER = struct.Struct("<8sII")
+
+MOVE_FUNCTIONS = tuple(MOVES.items())
+
+
+def symmetries(cells):
+    """Return the cell tuple under all 8 rotations and reflections of the board"""
+    result = []
+    for k in range(8):
+        mapped = []
+        for cell in cells:
+            row, col = divmod(cell, 4)
+            for _ in range(k % 4):
+                row, col = col, 3 - row  # Rotate 90 degrees
+            if k >= 4:
+                col = 3 - col  # Mirror
+            mapped.append(row * 4 + col)
+        result.append(tuple(mapped))
+    return result
+
+
+class NTupleNetwork:
+    """Position evaluator made of n-tuple lookup tables over the board.
+
+    Every pattern is sampled under all 8 board symmetries. The weights are a
+    flat float32 buffer memory-mapped straight from the weight file, so even
+    multi-hundred-MB tables open instantly and read-only opens share the same
+    page cache between processes.
+    """
+
+    def __init__(self, path, writable=False, patterns=DEFAULT_PATTERNS):
+        self.path = path
+        self.writable = writable
+        if not os.path.exists(path):
+            if not writable:
+                raise FileNotFoundError(f"No n-tuple weights at {path}")
+            self._create(path, patterns)
+
+        with open(path, "r+b" if writable else "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, count, length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an n-tuple weight file")
+        cells = self._mmap[HEADER.size:HEADER.size + count * length]
+        self.patterns = tuple(tuple(cells[i * length:(i + 1) * length]) for i in range(count))
+        self.table_size = 16 ** length
+        self.weights = memoryview(self._mmap)[HEADER_SIZE:].cast("f")
+
+        # Every (table offset, symmetric cell tuple) feature of the network
+        self.features = []
+        for index, pattern in enumerate(self.patterns):
+            for cells in symmetries(pattern):
+                self.features.append((index * self.table_size, cells))
+
+    @staticmethod
+    def _create(path, patterns):
+        length = len(patterns[0])
+        if any(len(pattern) != length for pattern in patterns):
+            raise ValueError("All n-tuple patterns must have the same length")
+        header = HEADER.pack(MAGIC, len(patterns), length) + bytes(cell for pattern in patterns for cell in pattern)
+        if len(header) > HEADER_SIZE:
+            raise ValueError("Too many n-tuple patterns for the weight file header")
+        with open(path, "wb") as file:
+            file.write(header.ljust(HEADER_SIZE, b"\0"))
+            # Extend the file without writing the zeros; the OS keeps it sparse
+            file.truncate(HEADER_SIZE + 4 * len(patterns) * 16 ** length)
+
+    def _indices(self, board):
+        ranks = [(board >> shift) & 0xF for shift in range(0, 64, 4)]
+        indices = []
+        for offset, cells in self.features:
+            index = 0
+            for cell in cells:
+                index = (index << 4) | ranks[cell]
+            indices.append(offset + index)
+        return indices
+
+    def value(self, board):
+        """Estimated future score of a packed board"""
+        weights = self.weights
+        return sum(weights[index] for index in self._indices(board))
+
+    def update(self, board, delta):
+        """Spread a TD error over every feature of a board"""
+        weights = self.weights
+        step = delta / len(self.features)
+        for index in self._indices(board):
+            weights[index] += step
+
+    def flush(self):
+        """Write trained weights back to disk"""
+        if self.writable:
+            self._mmap.flush()
+
+    def close(self):
+        self.weights.release()
+        self._mmap.close()
+
+    def best_afterstate(self, board):
+        """Return (direction, reward, afterstate, value) of the greedy move,
+        or None if no move is left"""
+        best = None
+        best_total = None
+        for direction, move in MOVE_FUNCTIONS:
+            after, reward = move(board)
+            if after == board:
+                continue
+            value = self.value(after)
+            if best_total is None or reward + value > best_total:
+                best_total = reward + value
+                best = (direction, reward, after, value)
+        return best
+
+
+class TDTrainer:
+    """TD(0) self-play trainer that learns afterstate values.
+
+    Games follow the GameGrid rules on the packed bitboard: the greedy move
+    is taken, then a 2 (90%) or 4 (10%) spawns on a random empty cell.
+    """
+
+    def __init__(self, network, alpha=0.1, seed=None):
+        self.network = network
+        self.alpha = alpha
+        self.rng = random.Random(seed)
+
+    def play_game(self):
+        """Play and learn from one game; returns (score, moves, max tile)"""
+        network = self.network
+        board = spawn(spawn(0, self.rng), self.rng)
+        score = 0
+        moves = 0
+        previous = None
+        previous_value = 0.0
+
+        while True:
+            best = network.best_afterstate(board)
+            if best is None:
+                break
+            _, reward, after, value = best
+            if previous is not None:
+                network.update(previous, self.alpha * (reward + value - previous_value))
+            previous, previous_value = after, value
+            score += reward
+            moves += 1
+            board = spawn(after, self.rng)
+
+        # A lost position is worth nothing
+        if previous is not None:
+            network.update(previous, -self.alpha * previous_value)
+        return score, moves, 1 << max_rank(board)
+
+    def train(self, games, report_every=100, out=sys.stdout):
+        """Train for a number of games, reporting throughput as it goes"""
+        start = time.perf_counter()
+        window_start = start
+        window_scores = []
+        window_moves = 0
+        reached_2048 = 0
+        for game in range(1, games + 1):
+            score, moves, max_tile = self.play_game()
+            window_scores.append(score)
+            window_moves += moves
+            reached_2048 += max_tile >= 2048
+            if game % report_every == 0 or game == games:
+                now = time.perf_counter()
+                elapsed = now - window_start
+                out.write(
+                    f"game {game}: avg score {sum(window_scores) / len(window_scores):.0f}, "
+                    f"2048 rate {reached_2048 / len(window_scores):.1%}, "
+                    f"{len(window_scores) / elapsed:.2f} games/sec, {window_moves / elapsed:.0f} moves/sec\n"
+                )
+                out.flush()
+                self.network.flush()
+                window_start = now
+                window_scores = []
+                window_moves = 0
+                reached_2048 = 0
+        self.network.flush()
+        return time.perf_counter() - start
+
+
+class NTuplePlayer:
+    """Autoplay policy that picks the move with the best learned afterstate"""
+
+    def __init__(self, path=NTUPLE_WEIGHTS):
+        self.network = NTupleNetwork(path)
+        self.moves = 0
+        self.search_time = 0.0
+
+    def best_move(self, grid):
+        """Return the best direction for a 4x4 grid, or None if no move is left"""
+        start = time.perf_counter()
+        best = self.network.best_afterstate(to_board(grid))
+        self.search_time += time.perf_counter() - start
+        self.moves += 1
+        return best[0] if best else None
+
+    def choose_move(self, game_grid):
+        """Autoplay hook used by GameController"""
+        return self.best_move(game_grid)
+
+    def close(self):
+        self.network.close()
+
+    def report(self):
+        """One-line summary of the evaluation speed"""
+        per_move = self.search_time / self.moves if self.moves else 0.0
+        return f"ntuple: {self.moves} moves, {per_move * 1000:.2f} ms/move"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train an n-tuple network by TD self-play")
+    parser.add_argument("--weights", default=NTUPLE_WEIGHTS, help="weight file, created if missing")
+    parser.add_argument("--games", type=int, default=1000, help="number of self-play games")
+    parser.add_argument("--alpha", type=float, default=0.1, help="TD learning rate")
+    parser.add_argument("--report-every", type=int, default=100, help="games between progress reports")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    network = NTupleNetwork(args.weights, writable=True)
+    trainer = TDTrainer(network, alpha=args.alpha, seed=args.seed)
+    elapsed = trainer.train(args.games, args.report_every)
+    print(f"trained {args.games} games in {elapsed:.1f}s ({args.games / elapsed:.2f} games/sec)")
+    network.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+
+# Render offscreen so the suite runs on headless machines
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from utils.config import WIDTH, HEIGHT, MOVE_ANIMATION_MS
+from models.core import GameCore, DIRECTIONS, DIRECTION_BITS
+from models.grid import GameGrid
+from models.bitboard import BitboardGrid
+from models.score import ScoreManager
+from utils.particles import ParticleSystem
+from utils.theme_manager import ThemeManager
+from views.renderer import GameRenderer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.15
+
+# Board distributions, as the fraction of a random game already played
+PHASES = {"early": 0.1, "mid": 0.5, "late": 0.9}
+
+
+def sample_states(phase, count=64, size=4, seed=2048):
+    """Packed (state, score) pairs taken part-way through random games"""
+    rng = random.Random(seed)
+    samples = []
+    while len(samples) < count:
+        core = GameCore(rng.getrandbits(32), size)
+        core.reset()
+        history = [(core.pack_state(), core.score)]
+        while core.legal_moves:
+            legal = [d for d in DIRECTIONS if core.legal_moves & DIRECTION_BITS[d]]
+            core.move(rng.choice(legal))
+            core.add_new_tile()
+            history.append((core.pack_state(), core.score))
+        samples.append(history[int(PHASES[phase] * (len(history) - 1))])
+    return samples
+
+
+def timed(func, rounds, inner):
+    """Time func() over rounds of inner calls; returns per-call ns per round"""
+    per_round = []
+    for _ in range(rounds):
+        total = 0
+        for _ in range(inner):
+            start = time.perf_counter_ns()
+            func()
+            total += time.perf_counter_ns() - start
+        per_round.append(total / inner)
+    return per_round
+
+
+def timed_with_setup(setup, func, rounds, inner):
+    """Like timed, but runs an untimed setup(i) before each call"""
+    per_round = []
+    for _ in range(rounds):
+        total = 0
+        for i in range(inner):
+            setup(i)
+            start = time.perf_counter_ns()
+            func()
+            total += time.perf_counter_ns() - start
+        per_round.append(total / inner)
+    return per_round
+
+
+def summarize(per_round, per_op=1):
+    ordered = sorted(value / per_op for value in per_round)
+    median = ordered[len(ordered) // 2]
+    return {
+        "ns_per_op": median,
+        "min_ns": ordered[0],
+        "max_ns": ordered[-1],
+        "ops_per_sec": 1e9 / median if median else 0.0,
+    }
+
+
+def bench_engine(rounds):
+    """GameGrid moves, spawns and end checks on each board distribution"""
+    results = {}
+    grid = GameGrid(seed=1)
+    tile_colors = {}
+    for phase in PHASES:
+        states = sample_states(phase)
+
+        def restore(i):
+            state, score = states[i % len(states)]
+            grid.unpack_state(state, score)
+            grid.particles.clear()
+
+        for direction in DIRECTIONS:
+            results[f"engine.move_tiles.{direction}.{phase}"] = summarize(timed_with_setup(
+                restore, lambda: grid.move_tiles(direction, tile_colors), rounds, len(states)))
+
+        def restore_with_room(i):
+            restore(i)
+            if not grid.core.empty_count():
+                grid.unpack_state(*states[0])
+
+        results[f"engine.add_new_tile.{phase}"] = summarize(timed_with_setup(
+            restore_with_room, grid.add_new_tile, rounds, len(states)))
+        results[f"engine.check_game_over.{phase}"] = summarize(timed_with_setup(
+            restore, grid.check_game_over, rounds, len(states)))
+        results[f"engine.check_win.{phase}"] = summarize(timed_with_setup(
+            restore, grid.check_win, rounds, len(states)))
+    return results
+
+
+def play_random_game(game_grid, rng):
+    """Play one game with uniformly random legal moves; returns the move count"""
+    game_grid.reset()
+    moves = 0
+    while game_grid.legal_moves:
+        legal = [d for d in DIRECTIONS if game_grid.legal_moves & DIRECTION_BITS[d]]
+        game_grid.move_tiles(rng.choice(legal), {})
+        game_grid.add_new_tile()
+        game_grid.update_animations(60.0)  # Finish every animation
+        game_grid.particles.clear()
+        moves += 1
+    return moves
+
+
+def bench_games(rounds, games=20):
+    """Whole random games per engine, reported per game"""
+    results = {}
+    for name, engine in (("grid", GameGrid), ("bitboard", BitboardGrid)):
+        game_grid = engine()
+
+        def play_games():
+            # The same games every round, so rounds are comparable
+            rng = random.Random(7)
+            for _ in range(games):
+                game_grid.seed(rng.getrandbits(32))
+                play_random_game(game_grid, rng)
+
+        results[f"game.throughput.{name}"] = summarize(timed(play_games, rounds, 1), games)
+    return results
+
+
+def bench_render(rounds, inner=20):
+    """Renderer hot paths drawn to an offscreen display"""
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    theme_manager = ThemeManager(default_theme='classic')
+    renderer = GameRenderer(screen, theme_manager)
+    score_manager = ScoreManager()
+    score_manager.current_score = 12345
+    score_manager.best_score = 23456
+
+    results = {}
+    results["theme.create_gradient_background"] = summarize(timed(
+        lambda: theme_manager.create_gradient_background(WIDTH, HEIGHT), rounds, inner))
+    # Restarting on the same theme; should be a lookup, not a rebuild
+    results["theme.update_theme_colors"] = summarize(timed(theme_manager.update_theme_colors, rounds, inner))
+
+    game_grid = GameGrid(seed=3)
+    game_grid.unpack_state(*sample_states("mid", count=1)[0])
+    results["render.draw_grid.static"] = summarize(timed(
+        lambda: renderer.draw_grid(game_grid, score_manager), rounds, inner))
+
+    dirty_renderer = GameRenderer(screen, theme_manager, dirty_rects=True)
+    results["render.draw_grid.dirty_static"] = summarize(timed(
+        lambda: dirty_renderer.draw_grid(game_grid, score_manager), rounds, inner))
+
+    state, score = sample_states("mid", count=1, seed=99)[0]
+
+    def animate(i):
+        game_grid.unpack_state(state, score)
+        for direction in DIRECTIONS:
+            if game_grid.can_move(direction):
+                game_grid.move_tiles(direction, theme_manager.tile_colors)
+                game_grid.add_new_tile()
+                break
+        game_grid.update_animations(MOVE_ANIMATION_MS / 2000)  # Halfway through the move
+        game_grid.particles.clear()
+
+    results["render.draw_grid.animating"] = summarize(timed_with_setup(
+        animate, lambda: renderer.draw_grid(game_grid, score_manager), rounds, inner))
+
+    particles = ParticleSystem(200, seed=5)
+    particles.emit(WIDTH // 2, HEIGHT // 2, (237, 194, 46), 200)
+    results["render.draw_particles.200"] = summarize(timed(
+        lambda: renderer.draw_particles(particles), rounds, inner))
+    results["render.draw_game_over"] = summarize(timed(
+        lambda: renderer.draw_game_over(score_manager), rounds, inner))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_metadata():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(part) for part in pygame.get_sdl_version()),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        "revision": git_revision(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline ns, current ns, change) for every regression"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        change = result["ns_per_op"] / previous["ns_per_op"] - 1
+        if change > threshold:
+            regressions.append((name, previous["ns_per_op"], result["ns_per_op"], change))
+    return regressions
+
+
+def format_time(ns):
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+SUITES = {
+    "engine": bench_engine,
+    "render": bench_render,
+    "game": bench_games,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine and renderer hot paths")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="suite to run; may be repeated (default: all)")
+    parser.add_argument("--rounds", type=int, default=7, help="timed rounds per benchmark (default: 7)")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed fractional slowdown before a benchmark counts as a regression "
+                             f"(default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    pygame.display.init()
+    pygame.font.init()
+    results = {}
+    for name in args.suite or SUITES:
+        results.update(SUITES[name](args.rounds))
+    report = {"metadata": machine_metadata(), "results": results}
+    pygame.quit()
+
+    baseline = {}
+    if not args.save_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"no baseline at {args.baseline}; record one on this machine with --save-baseline", file=sys.stderr)
+            baseline = None
+        else:
+            with open(args.baseline) as file:
+                baseline = json.load(file)["results"]
+
+    for name, result in results.items():
+        line = f"{name:40} {format_time(result['ns_per_op']):>12} {result['ops_per_sec']:>12.1f}/s"
+        if baseline and name in baseline:
+            line += f" {result['ns_per_op'] / baseline[name]['ns_per_op'] - 1:+8.1%}"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        return 2  # Nothing to compare against must not pass as "no regressions"
+    regressions = compare(results, baseline, args.threshold)
+    for name, previous, current, change in regressions:
+        print(f"REGRESSION {name}: {format_time(previous)} -> {format_time(current)} ({change:+.1%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,43 +1,225 @@
 import pygame
 import sys
-from utils.config import FPS, THEMES
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.config import (
+    FPS, THEMES, GRID_SIZE, UNDO_MEMORY_LIMIT, IDLE_TIMEOUT_MS, GAME_OVER_FPS, INPUT_QUEUE_SIZE, INPUT_COALESCE,
+    THEME_WARMUP,
+)
 from models.grid import GameGrid
+from models.history import UndoHistory
+from models.recording import GameRecorder
 from models.score import ScoreManager
 from utils.theme_manager import ThemeManager
+from utils.profiler import FrameProfiler, EVENTS, UPDATE, OVERLAY, FLIP, TICK
 from views.renderer import GameRenderer
 
+# Arrow keys and the direction they move the tiles
+MOVE_KEYS = {
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right",
+    pygame.K_UP: "up",
+    pygame.K_DOWN: "down",
+}
+
+# Game engines selectable at startup
+ENGINES = ('grid', 'bitboard')
+
+def create_engine(name, seed=None, grid_size=GRID_SIZE):
+    """Build a game engine by name (the bitboard is imported lazily, as it
+    precomputes its row tables on import)"""
+    if name == 'grid':
+        return GameGrid(seed, grid_size)
+    if name == 'bitboard':
+        from models.bitboard import BitboardGrid
+        return BitboardGrid(seed, grid_size)
+    raise ValueError(f"Unknown engine: {name}")
+
+# Autoplay policies selectable at startup or with the A key
+AUTOPLAYERS = ('expectimax', 'montecarlo', 'ntuple')
+
+def create_autoplayer(name):
+    """Build an autoplay policy by name (imported lazily, as the AI modules
+    precompute large tables on import)"""
+    if name == 'expectimax':
+        from ai.expectimax import ExpectimaxPlayer
+        return ExpectimaxPlayer()
+    if name == 'montecarlo':
+        from ai.montecarlo import MonteCarloPlayer
+        return MonteCarloPlayer()
+    if name == 'ntuple':
+        from ai.ntuple import NTuplePlayer
+        return NTuplePlayer()
+    raise ValueError(f"Unknown autoplayer: {name}")
+
 class GameController:
-    def __init__(self, screen):
+    def __init__(self, screen, engine='grid', seed=None, grid_size=GRID_SIZE, autoplay=None, record=None,
+                 profile=False, profile_log=None, dirty_rects=False, idle_wait=True, startup=None):
         self.screen = screen
         self.clock = pygame.time.Clock()
-        self.game_grid = GameGrid()
+        self.game_grid = create_engine(engine, seed, grid_size)
         self.score_manager = ScoreManager()
         self.theme_manager = ThemeManager(default_theme='classic')
-        self.renderer = GameRenderer(screen, self.theme_manager)
+        self.profiler = FrameProfiler(1000 / FPS, log_path=profile_log)
+        if profile:
+            self.profiler.toggle_overlay()
+        self.renderer = GameRenderer(screen, self.theme_manager, self.profiler, dirty_rects)
         self.running = True
         self.game_over = False
-        self.moved = False
         self.restart_button_rect = None
         self.exit_button_rect = None
+        self.idle_wait = idle_wait  # Sleep on the event queue while nothing moves
+        self.dt = 0.0  # Seconds since the previous frame
+        self.pending_events = []  # Event that woke an idle wait, handled first next frame
+        self.move_queue = deque()  # Directions pressed but not yet applied
+        self.coalesce = INPUT_COALESCE
+        self.history = UndoHistory(self.game_grid.state_size, UNDO_MEMORY_LIMIT)
+        
+        # Every game gets its own seed so that it can be reproduced
+        self.seeds = random.Random(seed)
+        self.recorder = None
+        if record:
+            self.recorder = GameRecorder(record)
+            self.recorder.attach(self.game_grid)
+        
+        # Autoplay; the policy is built once the first frame is on screen
+        self.autoplayer = None
+        self.autoplay = False
+        self.search_thread = None
+        self.autoplay_search = None  # Future of the move being searched for
+        self.search_state = None  # Packed grid the search started from
+        self.initial_autoplay = autoplay
+        self.startup = startup  # StartupTimer to report at the first frame, if any
+    
+    def set_autoplay(self, name):
+        """Turn on autoplay with the named policy"""
+        if self.game_grid.size != 4:
+            raise ValueError("Autoplay is only available on the 4x4 grid")
+        try:
+            self.autoplayer = create_autoplayer(name)
+        except (OSError, ValueError) as error:
+            print(f"Autoplay {name} is unavailable: {error}")
+            return
+        self.autoplay = True
+        self.autoplay_search = None
+        if self.search_thread is None:
+            self.search_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autoplay")
+    
+    def toggle_autoplay(self):
+        """Switch autoplay on or off, reporting search statistics when it stops"""
+        if self.autoplay:
+            self.autoplay = False
+            print(self.autoplayer.report())
+        elif self.autoplayer is not None:
+            self.autoplay = True
+        elif self.game_grid.size == 4:
+            self.set_autoplay(AUTOPLAYERS[0])
+    
+    def play_autoplay_move(self):
+        """Start the autoplayer's search on the helper thread, or make its
+        move once the search has finished, so frames keep coming meanwhile"""
+        if self.autoplay_search is None:
+            self.search_state = self.game_grid.pack_state()
+            grid = [list(row) for row in self.game_grid.grid]
+            self.autoplay_search = self.search_thread.submit(self.autoplayer.choose_move, grid)
+            return
+        if not self.autoplay_search.done():
+            return
+        direction = self.autoplay_search.result()
+        self.autoplay_search = None
+        if self.game_grid.pack_state() != self.search_state:
+            return  # The board changed during the search (keys, undo); search again
+        if direction is not None:
+            self.make_move(direction)
+        self.check_for_possible_moves()
+        if self.game_over:
+            print(self.autoplayer.report())
+    
+    def make_move(self, direction):
+        """Move the tiles and spawn the next one straight away, remembering
+        the previous state for undo. The animations catch up afterwards."""
+        state = self.game_grid.pack_state()
+        score = self.game_grid.score
+        if self.game_grid.move_tiles(direction, self.theme_manager.tile_colors):
+            self.history.record(state, score)
+            self.score_manager.update_score(self.game_grid.score)
+            self.game_grid.add_new_tile()
+        self.check_for_possible_moves()
+    
+    def queue_move(self, direction):
+        """Buffer a move key until the next update; a full queue is applied
+        first, so no key is dropped"""
+        if len(self.move_queue) >= INPUT_QUEUE_SIZE:
+            self.apply_queued_moves()
+        self.move_queue.append(direction)
+    
+    def apply_queued_moves(self, limit=None):
+        """Apply buffered moves to the grid in order. Each move fast-forwards
+        the animations of the one before, so several moves in one frame
+        collapse into the last one's animation."""
+        applied = 0
+        while self.move_queue and (limit is None or applied < limit):
+            direction = self.move_queue.popleft()
+            if self.game_over:
+                continue
+            # Moves that would not change the grid are rejected
+            if self.game_grid.can_move(direction):
+                self.make_move(direction)
+            applied += 1
+    
+    def undo(self):
+        """Restore the state before the last move (not while recording)"""
+        if self.recorder is not None:
+            return
+        self.apply_queued_moves()
+        self.restore(self.history.undo(self.game_grid.pack_state(), self.game_grid.score))
+    
+    def redo(self):
+        """Replay the last undone move (not while recording)"""
+        if self.recorder is not None:
+            return
+        self.apply_queued_moves()
+        self.restore(self.history.redo(self.game_grid.pack_state(), self.game_grid.score))
+    
+    def restore(self, entry):
+        """Put a state from the undo history back on the grid"""
+        if entry is None:
+            return
+        state, score = entry
+        self.game_grid.unpack_state(state, score)
+        self.score_manager.update_score(score)
+        self.game_over = False
+        self.check_for_possible_moves()
     
     def reset_game(self):
         """Reset the game state"""
+        self.history.clear()
+        self.move_queue.clear()
+        game_seed = self.seeds.getrandbits(63)
+        self.game_grid.seed(game_seed)
+        if self.recorder is not None:
+            self.recorder.start_game(self.game_grid.size, game_seed)
         self.game_grid.reset()
         self.score_manager.reset_score()
         self.theme_manager.update_theme_colors()
         self.game_over = False
-        self.moved = False
+        self.renderer.invalidate()
     
     def handle_events(self):
         """Handle user input events"""
-        for event in pygame.event.get():
+        events = self.pending_events + pygame.event.get()
+        self.pending_events = []
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             
+            # The window contents may have been lost
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.renderer.invalidate()
+            
             # Handle key presses during active gameplay
-            if event.type == pygame.KEYDOWN and not self.game_over and len(self.game_grid.tile_animations) == 0:
-                self.moved = False
-                
+            if event.type == pygame.KEYDOWN and not self.game_over:
                 # Theme selection keys
                 if event.key == pygame.K_1:
                     self.theme_manager.set_theme('classic')
@@ -49,28 +231,16 @@ class GameController:
                     self.theme_manager.set_theme('purple')
                 elif event.key == pygame.K_5:
                     self.theme_manager.set_theme('green')
-                # Movement keys
-                elif event.key == pygame.K_LEFT:
-                    self.moved = self.game_grid.move_tiles("left", self.theme_manager.tile_colors)
-                elif event.key == pygame.K_RIGHT:
-                    self.moved = self.game_grid.move_tiles("right", self.theme_manager.tile_colors)
-                elif event.key == pygame.K_UP:
-                    self.moved = self.game_grid.move_tiles("up", self.theme_manager.tile_colors)
-                elif event.key == pygame.K_DOWN:
-                    self.moved = self.game_grid.move_tiles("down", self.theme_manager.tile_colors)
+                # Movement keys are queued and applied in update, even mid-animation
+                elif event.key in MOVE_KEYS:
+                    self.queue_move(MOVE_KEYS[event.key])
+                elif event.key == pygame.K_a:
+                    self.toggle_autoplay()
                 elif event.key == pygame.K_ESCAPE:  # Exit on Escape key
                     self.running = False
                 
-                if self.moved:
-                    # Update score
-                    self.score_manager.update_score(self.game_grid.score)
-                    
-                    # Check for game over
-                    if self.game_grid.check_game_over():
-                        self.game_over = True
-                elif not self.game_grid.check_game_over():
-                    # If no move was made and game isn't over yet, check if any move is possible
-                    self.check_for_possible_moves()
+                # Check for game over
+                self.check_for_possible_moves()
             
             # Theme selection should work even during game over
             if event.type == pygame.KEYDOWN:
@@ -88,6 +258,16 @@ class GameController:
                 # Restart on R key during game over
                 if event.key == pygame.K_r and self.game_over:
                     self.reset_game()
+                
+                # Frame timing overlay
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                
+                # Undo and redo also work on the game over screen
+                if event.key == pygame.K_u:
+                    self.undo()
+                elif event.key == pygame.K_y:
+                    self.redo()
             
             # Handle mouse clicks for buttons during game over
             if event.type == pygame.MOUSEBUTTONDOWN and self.game_over:
@@ -102,37 +282,60 @@ class GameController:
                     self.running = False
     
     def check_for_possible_moves(self):
-        """Check if any move is possible"""
-        # Save current state
-        original_grid = [row[:] for row in self.game_grid.grid]
-        original_score = self.game_grid.score
-        
-        # Try each direction
-        for direction in ["left", "right", "up", "down"]:
-            if self.game_grid.move_tiles(direction, self.theme_manager.tile_colors):
-                # If a move is possible, restore original state and return
-                self.game_grid.grid = original_grid
-                self.game_grid.score = original_score
-                self.game_grid.tile_animations = []
-                return
-        
-        # If no move is possible, game is over
-        self.game_over = True
+        """End the game if the grid has no legal moves left"""
+        if self.game_grid.legal_moves == 0:
+            self.game_over = True
+            self.score_manager.flush()  # Don't leave a new best to the next interval
     
     def update(self):
         """Update game state"""
+        # Keys pressed this frame reach the grid before anything is drawn
+        self.apply_queued_moves(None if self.coalesce else 1)
+        
         # Update animations
-        self.game_grid.update_animations()
-        self.game_grid.update_particles()
+        self.game_grid.update_animations(self.dt)
+        self.game_grid.update_particles(self.dt)
         
-        # Add new tile if animations finished and one is needed
-        if len(self.game_grid.tile_animations) == 0 and self.moved and not self.game_grid.new_tile_animations:
-            self.game_grid.add_new_tile()
-            self.moved = False
-            
-            # Check for game over again after adding new tile
-            if self.game_grid.check_game_over():
-                self.game_over = True
+        # Let the autoplayer move once the board has settled
+        if (self.autoplay and not self.game_over and not self.move_queue
+                and not self.game_grid.tile_animations and not self.game_grid.new_tile_animations):
+            self.play_autoplay_move()
+    
+    def is_animating(self):
+        """Whether the next frame will look different from this one"""
+        grid = self.game_grid
+        return bool(
+            self.move_queue or grid.tile_animations or grid.new_tile_animations or grid.particles
+            or (self.autoplay and not self.game_over)
+        )
+    
+    def wait_for_next_frame(self):
+        """Run at full frame rate while something moves; otherwise block on
+        the event queue until input arrives, waking at GAME_OVER_FPS for the
+        game over pulse or after IDLE_TIMEOUT_MS"""
+        if not self.idle_wait or self.is_animating():
+            self.dt = self.clock.tick(FPS) / 1000
+            return
+        if self.game_over and GAME_OVER_FPS:
+            timeout = 1000 // GAME_OVER_FPS
+        else:
+            timeout = IDLE_TIMEOUT_MS
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.pending_events.append(event)  # Ahead of anything queued behind it
+        # Time spent asleep must not count towards animations started on waking
+        self.clock.tick()
+        self.dt = 0.0
+    
+    def after_first_frame(self):
+        """Build what the first frame does not need"""
+        if self.startup is not None:
+            self.startup.mark("first frame")
+            print(self.startup.report())
+        if THEME_WARMUP:
+            self.theme_manager.warm_up()
+        if self.initial_autoplay:
+            self.set_autoplay(self.initial_autoplay)
     
     def render(self):
         """Render game state"""
@@ -142,22 +345,44 @@ class GameController:
         # Draw game over screen if game is over
         if self.game_over:
             self.restart_button_rect, self.exit_button_rect = self.renderer.draw_game_over(self.score_manager)
+        if self.profiler.show:
+            self.renderer.draw_profile_overlay(self.profiler)
+        self.profiler.lap(OVERLAY)
         
         # Update display
-        pygame.display.flip()
+        self.renderer.present()
+        self.profiler.lap(FLIP)
     
     def run(self):
         """Main game loop"""
         self.reset_game()
+        first_frame = True
         
         while self.running:
+            self.profiler.start_frame()
             self.handle_events()
+            self.profiler.lap(EVENTS)
             self.update()
+            self.profiler.lap(UPDATE)
             self.render()
-            self.clock.tick(FPS)
+            if first_frame:
+                self.after_first_frame()
+                first_frame = False
+            self.wait_for_next_frame()
+            self.profiler.lap(TICK)
+            self.profiler.end_frame()
+        
+        if self.search_thread is not None:
+            self.search_thread.shutdown()  # Let a search in flight finish first
+        if self.autoplayer is not None:
+            print(self.autoplayer.report())
+            self.autoplayer.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.profiler.close()
         
-        # Save the high score before exiting
-        self.score_manager.save_high_score(self.score_manager.best_score)
+        # Write out a high score still waiting to be saved
+        self.score_manager.close()
         
         pygame.quit()
         sys.exit() 
\ No newline at end of file
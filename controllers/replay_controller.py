@@ -0,0 +1,148 @@
+import pygame
+import sys
+import time
+from utils.config import FPS, WINDOW_TITLE
+from models.core import DIRECTIONS
+from models.grid import GameGrid
+from models.score import ScoreManager
+from models.recording import DIRECTION_MASK, SPAWN_FOUR, NO_MOVE, NO_SPAWN
+from models.keyframes import open_game
+from utils.theme_manager import ThemeManager
+from views.renderer import GameRenderer
+
+class ReplayController:
+    """Plays a recorded game back through GameRenderer.
+
+    Space pauses, Right steps one move while paused, Up/Down change the
+    playback speed and Esc exits. Left steps back, Page Up/Down jump a
+    keyframe interval, Home/End go to either end, and clicking or dragging
+    the scrub bar seeks; seeks go through the game's keyframe index.
+    """
+
+    def __init__(self, screen, path, game_index=0, moves_per_second=8, startup=None):
+        self.screen = screen
+        self.clock = pygame.time.Clock()
+        self.game = open_game(path, game_index)
+        self.game_grid = GameGrid(self.game.seed, self.game.size)
+        self.score_manager = ScoreManager()
+        self.theme_manager = ThemeManager(default_theme='classic')
+        self.renderer = GameRenderer(screen, self.theme_manager)
+        self.running = True
+        self.paused = False
+        self.scrubbing = False
+        self.scrub_bar = None
+        self.moves_per_second = moves_per_second
+        self.move_count = self.game.moves
+        self.pending_spawn = None
+        self.last_step = 0
+        self.dt = 0.0
+        self.startup = startup  # StartupTimer to report at the first frame, if any
+        self.seek(0)
+
+    def apply_spawn(self, code, cell):
+        pos = divmod(cell, self.game.size)
+        self.game_grid.place_tile(pos, 4 if code & SPAWN_FOUR else 2)
+
+    def seek(self, move):
+        """Jump straight to the position after a number of moves"""
+        state, score, self.position = self.game.seek(move)
+        self.game_grid.unpack_state(state, score)
+        self.game_grid.particles.clear()
+        self.score_manager.current_score = score
+        self.moves_played = max(0, min(move, self.move_count))
+        self.pending_spawn = None
+        self.update_caption()
+
+    def update_caption(self):
+        pygame.display.set_caption(f"{WINDOW_TITLE} - replay move {self.moves_played}/{self.move_count}")
+
+    def step(self):
+        """Play the next recorded move; its spawn follows once the tiles settle"""
+        if self.position >= len(self.game):
+            return
+        code, cell = self.game.record(self.position)
+        self.position += 1
+        if not code & NO_MOVE:
+            self.game_grid.move_tiles(DIRECTIONS[code & DIRECTION_MASK], self.theme_manager.tile_colors)
+            self.score_manager.current_score = self.game_grid.score
+            self.moves_played += 1
+        if not code & NO_SPAWN:
+            self.pending_spawn = (code, cell)
+        self.update_caption()
+
+    def scrub_to(self, x):
+        """Seek to the move under an x coordinate of the scrub bar"""
+        fraction = (x - self.scrub_bar.left) / max(1, self.scrub_bar.width)
+        self.seek(round(max(0.0, min(1.0, fraction)) * self.move_count))
+
+    def handle_events(self):
+        """Handle playback controls"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                elif event.key == pygame.K_RIGHT and self.paused and self.pending_spawn is None:
+                    self.step()
+                elif event.key == pygame.K_UP:
+                    self.moves_per_second = min(self.moves_per_second * 2, FPS)
+                elif event.key == pygame.K_DOWN:
+                    self.moves_per_second = max(self.moves_per_second / 2, 0.25)
+                elif event.key == pygame.K_LEFT:
+                    self.seek(self.moves_played - 1)
+                elif event.key == pygame.K_PAGEUP:
+                    self.seek(self.moves_played - self.game.interval)
+                elif event.key == pygame.K_PAGEDOWN:
+                    self.seek(self.moves_played + self.game.interval)
+                elif event.key == pygame.K_HOME:
+                    self.seek(0)
+                elif event.key == pygame.K_END:
+                    self.seek(self.move_count)
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if self.scrub_bar and self.scrub_bar.inflate(0, 12).collidepoint(event.pos):
+                    self.scrubbing = True
+                    self.scrub_to(event.pos[0])
+            if event.type == pygame.MOUSEMOTION and self.scrubbing:
+                self.scrub_to(event.pos[0])
+            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.scrubbing = False
+
+    def update(self):
+        """Advance animations and playback"""
+        self.game_grid.update_animations(self.dt)
+        self.game_grid.update_particles(self.dt)
+
+        if self.pending_spawn is not None and not self.game_grid.tile_animations:
+            self.apply_spawn(*self.pending_spawn)
+            self.pending_spawn = None
+
+        now = time.perf_counter() * 1000
+        if (not self.paused and not self.scrubbing and self.pending_spawn is None
+                and now - self.last_step >= 1000 / self.moves_per_second):
+            self.last_step = now
+            self.step()
+
+    def render(self):
+        """Render the replayed game"""
+        self.renderer.draw_grid(self.game_grid, self.score_manager)
+        self.scrub_bar = self.renderer.draw_scrub_bar(self.moves_played, self.move_count)
+        self.renderer.present()
+
+    def run(self):
+        """Playback loop"""
+        while self.running:
+            self.handle_events()
+            self.update()
+            self.render()
+            if self.startup is not None:
+                self.startup.mark("first frame")
+                print(self.startup.report())
+                self.startup = None
+            self.dt = self.clock.tick(FPS) / 1000
+
+        self.game.close()
+        pygame.quit()
+        sys.exit()
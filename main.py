@@ -1,19 +1,83 @@
-import pygame
+from utils.profiler import StartupTimer
+startup = StartupTimer()  # Started before the other imports so that they are timed too
+
 import os
-from utils.config import WIDTH, HEIGHT, WINDOW_TITLE
-from controllers.game_controller import GameController
+import pygame
+import argparse
+from utils.config import WIDTH, HEIGHT, WINDOW_TITLE, GRID_SIZE, NTUPLE_WEIGHTS
+from controllers.game_controller import GameController, ENGINES, AUTOPLAYERS
+from controllers.replay_controller import ReplayController
+from models.recording import ReplayError
+startup.mark("imports")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="grid",
+                        help="game engine to play on (default: grid)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for tile spawns, for reproducible games")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help=f"number of cells per side, 2 to 32 (default: {GRID_SIZE})")
+    parser.add_argument("--autoplay", choices=AUTOPLAYERS, default=None,
+                        help="let an AI player make the moves (4x4 only)")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="append a binary log of every game to PATH")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="play back a recorded game instead of playing")
+    parser.add_argument("--replay-game", type=int, default=0,
+                        help="index of the game in the log to play back (default: 0)")
+    parser.add_argument("--replay-speed", type=float, default=8,
+                        help="playback speed in moves per second (default: 8)")
+    parser.add_argument("--profile", action="store_true",
+                        help="show the frame timing overlay from the start (toggle with F3)")
+    parser.add_argument("--profile-log", metavar="PATH", default=None,
+                        help="stream per-frame stage timings to PATH (CSV, or JSON lines for .jsonl)")
+    parser.add_argument("--no-idle-wait", action="store_true",
+                        help="keep running at full frame rate when nothing is moving")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw and present only the parts of the window that changed")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print how long each startup step took once the first frame is shown")
+    args = parser.parse_args()
+    if not 2 <= args.size <= 32:
+        parser.error("--size must be between 2 and 32")
+    if args.autoplay and args.size != 4:
+        parser.error("--autoplay needs a 4x4 grid")
+    if args.engine == "bitboard" and args.size != 4:
+        parser.error("--engine bitboard needs a 4x4 grid")
+    if args.autoplay == "ntuple" and not os.path.exists(NTUPLE_WEIGHTS):
+        parser.error(f"--autoplay ntuple needs trained weights in {NTUPLE_WEIGHTS} (python -m ai.ntuple)")
+    return args
 
 def main():
-    # Initialize pygame
-    pygame.init()
+    args = parse_args()
+    
+    timer = startup if args.startup_report else None
+    
+    # Initialize only the pygame modules the game uses (no audio, joystick, ...)
+    pygame.display.init()
+    pygame.font.init()
+    startup.mark("pygame init")
     
     # Set up the display
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption(WINDOW_TITLE)
+    startup.mark("display")
     
     # Create and run the game controller
-    game = GameController(screen)
+    if args.replay:
+        try:
+            game = ReplayController(screen, args.replay, args.replay_game, args.replay_speed, startup=timer)
+        except ReplayError as error:
+            raise SystemExit(f"Cannot replay: {error}")
+    else:
+        game = GameController(screen, engine=args.engine, seed=args.seed, grid_size=args.size,
+                              autoplay=args.autoplay, record=args.record,
+                              profile=args.profile, profile_log=args.profile_log,
+                              dirty_rects=args.dirty_rects, idle_wait=not args.no_idle_wait,
+                              startup=timer)
+    startup.mark("controller")
     game.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
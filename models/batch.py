@@ -0,0 +1,166 @@
+import numpy as np
+from utils.config import GRID_SIZE
+from models.core import DIRECTIONS
+
+
+def _left_view(boards, direction):
+    """Rotate a stack of boards so that the move becomes a left move"""
+    if direction == 1:  # right
+        return boards[:, :, ::-1]
+    if direction == 2:  # up
+        return boards.transpose(0, 2, 1)
+    if direction == 3:  # down
+        return boards.transpose(0, 2, 1)[:, :, ::-1]
+    return boards
+
+
+def _from_left_view(boards, direction):
+    """Undo _left_view"""
+    if direction == 1:
+        return boards[:, :, ::-1]
+    if direction == 2:
+        return boards.transpose(0, 2, 1)
+    if direction == 3:
+        return boards[:, :, ::-1].transpose(0, 2, 1)
+    return boards
+
+
+def slide_left(boards):
+    """Move a stack of rank boards left.
+
+    Follows GameCore.move exactly: tiles are packed towards column 0 and then
+    merged pairwise from the left, each tile merging at most once. Returns
+    (new_boards, score_gained) where score_gained has one entry per board.
+    """
+    count, size = boards.shape[0], boards.shape[-1]
+    rows = boards.reshape(-1, size)
+
+    # Pack non-zero tiles to the left, keeping their order
+    order = np.argsort(rows == 0, axis=1, kind="stable")
+    rows = np.take_along_axis(rows, order, axis=1)
+
+    gained = np.zeros(rows.shape[0], dtype=np.int64)
+    for j in range(size - 1):
+        merge = (rows[:, j] != 0) & (rows[:, j] == rows[:, j + 1])
+        if not merge.any():
+            continue
+        rows[merge, j] += 1
+        gained[merge] += np.left_shift(1, rows[merge, j].astype(np.int64))
+        # Close the gap left by the absorbed tile
+        rows[merge, j + 1:-1] = rows[merge, j + 2:]
+        rows[merge, -1] = 0
+
+    return rows.reshape(count, size, size), gained.reshape(count, size).sum(axis=1)
+
+
+class BatchEngine:
+    """Vectorized engine that steps many boards per call.
+
+    Boards are held as log2 ranks (0 for empty) in an (N, size, size) uint8
+    array, with per-board scores alongside. Every call works on the whole
+    batch, so the Python overhead is per call rather than per board.
+    """
+
+    def __init__(self, count, size=GRID_SIZE, seed=None):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.zeros((count, size, size), dtype=np.uint8)
+        self.scores = np.zeros(count, dtype=np.int64)
+
+    def __len__(self):
+        return self.boards.shape[0]
+
+    @classmethod
+    def from_grids(cls, grids, seed=None):
+        """Build a batch from a list of tile-value grids"""
+        values = np.asarray(grids, dtype=np.int64)
+        engine = cls(values.shape[0], values.shape[-1], seed)
+        nonzero = values > 0
+        engine.boards[nonzero] = np.log2(values[nonzero]).astype(np.uint8)
+        return engine
+
+    def values(self):
+        """Return the boards as tile values instead of ranks"""
+        return np.where(self.boards > 0, np.left_shift(1, self.boards.astype(np.int64)), 0)
+
+    def to_grid(self, index):
+        """Return one board as a list of lists of tile values"""
+        return self.values()[index].tolist()
+
+    def reset(self):
+        """Clear every board and add the two starting tiles"""
+        self.boards[:] = 0
+        self.scores[:] = 0
+        self.spawn()
+        self.spawn()
+
+    def spawn(self, mask=None):
+        """Add a 2 (90%) or 4 (10%) to a random empty cell of each board.
+
+        Only boards selected by the boolean mask (all by default) that still
+        have an empty cell receive a tile.
+        """
+        flat = self.boards.reshape(len(self), -1)
+        empty = flat == 0
+        targets = empty.any(axis=1)
+        if mask is not None:
+            targets &= mask
+        index = np.nonzero(targets)[0]
+        if index.size == 0:
+            return
+
+        # Random keys on empty cells only; the largest key picks the cell
+        keys = self.rng.random((index.size, flat.shape[1]))
+        keys[~empty[index]] = -1.0
+        cells = keys.argmax(axis=1)
+        ranks = np.where(self.rng.random(index.size) < 0.9, 1, 2).astype(np.uint8)
+        flat[index, cells] = ranks
+
+    def step(self, directions, spawn=True):
+        """Move every board in its own direction.
+
+        directions holds one entry per board, either an index into
+        DIRECTIONS or the direction name. Returns (score_delta, moved) arrays.
+        When spawn is true, a new tile is added to every board that moved.
+        """
+        directions = np.asarray(directions)
+        if directions.dtype.kind in "US":
+            directions = np.array([DIRECTIONS.index(name) for name in directions.ravel()])
+
+        new_boards = self.boards.copy()
+        score_delta = np.zeros(len(self), dtype=np.int64)
+        for direction in range(len(DIRECTIONS)):
+            index = np.nonzero(directions == direction)[0]
+            if index.size == 0:
+                continue
+            view = np.ascontiguousarray(_left_view(self.boards[index], direction))
+            moved_view, gained = slide_left(view)
+            new_boards[index] = _from_left_view(moved_view, direction)
+            score_delta[index] = gained
+
+        moved = (new_boards != self.boards).any(axis=(1, 2))
+        self.boards = new_boards
+        self.scores += score_delta
+        if spawn:
+            self.spawn(moved)
+        return score_delta, moved
+
+    def legal_moves(self):
+        """Return an (N, 4) boolean array of which directions would move"""
+        legal = np.zeros((len(self), len(DIRECTIONS)), dtype=bool)
+        for direction in range(len(DIRECTIONS)):
+            view = _left_view(self.boards, direction)
+            # A line can move left if a tile has an empty cell or an equal tile to its left
+            left, right = view[:, :, :-1], view[:, :, 1:]
+            slide = (left == 0) & (right != 0)
+            merge = (left != 0) & (left == right)
+            legal[:, direction] = (slide | merge).any(axis=(1, 2))
+        return legal
+
+    def game_over(self):
+        """Return a boolean mask of boards with no moves left"""
+        boards = self.boards
+        has_empty = (boards == 0).any(axis=(1, 2))
+        horizontal = (boards[:, :, :-1] == boards[:, :, 1:]).any(axis=(1, 2))
+        vertical = (boards[:, :-1, :] == boards[:, 1:, :]).any(axis=(1, 2))
+        return ~(has_empty | horizontal | vertical)
@@ -0,0 +1,360 @@
+import random
+from utils.config import GRID_SIZE
+from models.core import MoveResult, DIRECTION_BITS, MOVE_LEFT, MOVE_RIGHT, MOVE_UP, MOVE_DOWN
+
+# The 4x4 board is packed into a single 64-bit integer. Each cell is a 4-bit
+# nibble holding log2 of the tile value (0 means empty), so the largest tile
+# that fits is 2**15 = 32768. Row i lives in bits 16*i..16*i+15 and column j
+# of that row in the nibble at bit 4*j.
+ROW_MASK = 0xFFFF
+COL_MASK = 0x000F000F000F000F
+MAX_RANK = 15
+
+# Precomputed row tables, indexed by a 16-bit row
+ROW_LEFT = [0] * 65536   # XOR diff applied to a row moved left
+ROW_RIGHT = [0] * 65536  # XOR diff applied to a row moved right
+COL_UP = [0] * 65536     # XOR diff spread over a column moved up
+COL_DOWN = [0] * 65536   # XOR diff spread over a column moved down
+ROW_SCORE = [0] * 65536  # Score gained by moving a row (same both ways)
+ROW_EMPTY = [0] * 65536  # Number of empty cells in a row
+
+
+def reverse_row(row):
+    """Reverse the order of the four nibbles in a row"""
+    return ((row >> 12) | ((row >> 4) & 0x00F0) | ((row << 4) & 0x0F00) | (row << 12)) & ROW_MASK
+
+
+def unpack_col(row):
+    """Spread the four nibbles of a row down a column of the board"""
+    return (row | (row << 12) | (row << 24) | (row << 36)) & COL_MASK
+
+
+def transpose(board):
+    """Transpose the board (swap rows and columns)"""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _build_tables():
+    """Fill the row tables by sliding every possible row to the left"""
+    for row in range(65536):
+        line = [(row >> 4 * i) & 0xF for i in range(4)]
+        tiles = [rank for rank in line if rank]
+
+        # Merge adjacent same-rank tiles, each tile merging at most once
+        result = []
+        score = 0
+        i = 0
+        while i < len(tiles):
+            if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < MAX_RANK:
+                rank = tiles[i] + 1
+                score += 1 << rank
+                result.append(rank)
+                i += 2
+            else:
+                result.append(tiles[i])
+                i += 1
+        result.extend([0] * (4 - len(result)))
+
+        moved = result[0] | (result[1] << 4) | (result[2] << 8) | (result[3] << 12)
+        reversed_row = reverse_row(row)
+        reversed_moved = reverse_row(moved)
+
+        ROW_LEFT[row] = row ^ moved
+        ROW_RIGHT[reversed_row] = reversed_row ^ reversed_moved
+        COL_UP[row] = unpack_col(row ^ moved)
+        COL_DOWN[reversed_row] = unpack_col(reversed_row ^ reversed_moved)
+        ROW_SCORE[row] = score
+        ROW_EMPTY[row] = 4 - len(tiles)
+
+
+_build_tables()
+
+
+def move_left(board):
+    """Return (new_board, score_delta) for a left move"""
+    return (
+        board
+        ^ ROW_LEFT[board & ROW_MASK]
+        ^ (ROW_LEFT[(board >> 16) & ROW_MASK] << 16)
+        ^ (ROW_LEFT[(board >> 32) & ROW_MASK] << 32)
+        ^ (ROW_LEFT[board >> 48] << 48)
+    ), row_score(board)
+
+
+def move_right(board):
+    """Return (new_board, score_delta) for a right move"""
+    return (
+        board
+        ^ ROW_RIGHT[board & ROW_MASK]
+        ^ (ROW_RIGHT[(board >> 16) & ROW_MASK] << 16)
+        ^ (ROW_RIGHT[(board >> 32) & ROW_MASK] << 32)
+        ^ (ROW_RIGHT[board >> 48] << 48)
+    ), row_score(board)
+
+
+def move_up(board):
+    """Return (new_board, score_delta) for an up move"""
+    t = transpose(board)
+    return (
+        board
+        ^ COL_UP[t & ROW_MASK]
+        ^ (COL_UP[(t >> 16) & ROW_MASK] << 4)
+        ^ (COL_UP[(t >> 32) & ROW_MASK] << 8)
+        ^ (COL_UP[t >> 48] << 12)
+    ), row_score(t)
+
+
+def move_down(board):
+    """Return (new_board, score_delta) for a down move"""
+    t = transpose(board)
+    return (
+        board
+        ^ COL_DOWN[t & ROW_MASK]
+        ^ (COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+        ^ (COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+        ^ (COL_DOWN[t >> 48] << 12)
+    ), row_score(t)
+
+
+MOVES = {
+    "left": move_left,
+    "right": move_right,
+    "up": move_up,
+    "down": move_down,
+}
+
+
+def row_score(board):
+    """Score gained by merging every row of the board"""
+    return (
+        ROW_SCORE[board & ROW_MASK]
+        + ROW_SCORE[(board >> 16) & ROW_MASK]
+        + ROW_SCORE[(board >> 32) & ROW_MASK]
+        + ROW_SCORE[board >> 48]
+    )
+
+
+def legal_moves(board):
+    """Return the bitmask of directions that would change the board"""
+    mask = 0
+    for row in (board & ROW_MASK, (board >> 16) & ROW_MASK, (board >> 32) & ROW_MASK, board >> 48):
+        if ROW_LEFT[row]:
+            mask |= MOVE_LEFT
+        if ROW_RIGHT[row]:
+            mask |= MOVE_RIGHT
+    t = transpose(board)
+    for col in (t & ROW_MASK, (t >> 16) & ROW_MASK, (t >> 32) & ROW_MASK, t >> 48):
+        if ROW_LEFT[col]:
+            mask |= MOVE_UP
+        if ROW_RIGHT[col]:
+            mask |= MOVE_DOWN
+    return mask
+
+
+def count_empty(board):
+    """Count the empty cells on the board"""
+    return (
+        ROW_EMPTY[board & ROW_MASK]
+        + ROW_EMPTY[(board >> 16) & ROW_MASK]
+        + ROW_EMPTY[(board >> 32) & ROW_MASK]
+        + ROW_EMPTY[board >> 48]
+    )
+
+
+def empty_cells(board):
+    """Return the nibble indices (4*row + col) of all empty cells"""
+    return [k for k in range(16) if not (board >> 4 * k) & 0xF]
+
+
+def spawn(board, rng):
+    """Return the board with a 2 (90%) or 4 (10%) on a random empty cell"""
+    target = rng.randrange(count_empty(board))
+    rank = 1 if rng.random() < 0.9 else 2
+    shift = 0
+    while True:
+        if not (board >> shift) & 0xF:
+            if target == 0:
+                return board | (rank << shift)
+            target -= 1
+        shift += 4
+
+
+def max_rank(board):
+    """Return log2 of the largest tile on the board"""
+    best = 0
+    while board:
+        rank = board & 0xF
+        if rank > best:
+            best = rank
+        board >>= 4
+    return best
+
+
+def from_grid(grid):
+    """Pack a 4x4 list of tile values into a board"""
+    board = 0
+    for i, row in enumerate(grid):
+        for j, value in enumerate(row):
+            if value:
+                board |= (value.bit_length() - 1) << (16 * i + 4 * j)
+    return board
+
+
+def to_board(grid):
+    """Accept a packed board, a 4x4 list of values, or a game grid object"""
+    if isinstance(grid, int):
+        return grid
+    if hasattr(grid, "board"):
+        return grid.board
+    if hasattr(grid, "grid"):
+        grid = grid.grid
+    if len(grid) != 4 or any(len(row) != 4 for row in grid):
+        raise ValueError("AI players only support a 4x4 grid")
+    return from_grid(grid)
+
+
+def to_grid(board):
+    """Unpack a board into a 4x4 list of tile values"""
+    grid = []
+    for i in range(4):
+        row = []
+        for j in range(4):
+            rank = (board >> (16 * i + 4 * j)) & 0xF
+            row.append(1 << rank if rank else 0)
+        grid.append(row)
+    return grid
+
+
+class BitboardGrid:
+    """Drop-in replacement for GameGrid that plays on a packed 64-bit board.
+
+    Moves, scores and empty-cell counts all go through the precomputed row
+    tables above. No animations or particles are produced, so the tile and
+    particle lists stay empty and the renderer simply draws the board.
+    The legal-move bitmask is cached per board value.
+    """
+
+    def __init__(self, seed=None, size=GRID_SIZE):
+        if size != 4:
+            raise ValueError("The bitboard engine only supports a 4x4 grid")
+        self.size = size
+        self.state_size = 8  # Bytes in a packed state
+        self.rng = random.Random(seed)
+        self.board = 0
+        self.score = 0
+        self._legal_board = None
+        self._legal_moves = 0
+        self.tile_animations = []
+        self.new_tile_animations = []
+        self.particles = []
+
+        # Event subscribers, as on GameCore
+        self.on_move = []   # callback(result)
+        self.on_spawn = []  # callback(pos, value)
+
+    @property
+    def grid(self):
+        return to_grid(self.board)
+
+    @grid.setter
+    def grid(self, grid):
+        self.board = from_grid(grid)
+
+    @property
+    def max_tile(self):
+        rank = max_rank(self.board)
+        return 1 << rank if rank else 0
+
+    @property
+    def legal_moves(self):
+        if self._legal_board != self.board:
+            self._legal_board = self.board
+            self._legal_moves = legal_moves(self.board)
+        return self._legal_moves
+
+    def can_move(self, direction):
+        """Check whether a move in the given direction would change the board"""
+        return bool(self.legal_moves & DIRECTION_BITS.get(direction, 0))
+
+    def pack_state(self):
+        """Pack the board into 8 bytes for the undo history"""
+        return self.board.to_bytes(8, "little")
+
+    def unpack_state(self, state, score):
+        """Restore a board packed by pack_state along with its score"""
+        self.board = int.from_bytes(state, "little")
+        self.score = score
+
+    def seed(self, seed=None):
+        """Re-seed the tile spawning RNG"""
+        self.rng.seed(seed)
+
+    def reset(self):
+        """Reset the board and score"""
+        self.board = 0
+        self.score = 0
+        self.add_new_tile()
+        self.add_new_tile()
+
+    def add_new_tile(self):
+        """Add a new tile (2 or 4) to a random empty cell.
+
+        Returns the (pos, value) of the new tile, or None if the board is full.
+        """
+        empty = count_empty(self.board)
+        if empty == 0:
+            return None
+        # Walk the nibbles to the chosen empty cell instead of building a list
+        target = self.rng.randrange(empty)
+        rank = 1 if self.rng.random() < 0.9 else 2  # 90% chance of 2, 10% of 4
+        shift = 0
+        while True:
+            if not (self.board >> shift) & 0xF:
+                if target == 0:
+                    self.board |= rank << shift
+                    pos, value = divmod(shift // 4, 4), 1 << rank
+                    for callback in self.on_spawn:
+                        callback(pos, value)
+                    return pos, value
+                target -= 1
+            shift += 4
+
+    def update_animations(self, dt=1 / 60):
+        """Nothing to animate on the bitboard engine"""
+
+    def update_particles(self, dt=1 / 60):
+        """Nothing to animate on the bitboard engine"""
+
+    def move_tiles(self, direction, tile_colors=None):
+        """Moves tiles in the specified direction and merges equal tiles."""
+        move = MOVES.get(direction)
+        if move is None:
+            return False
+        board, gained = move(self.board)
+        if board == self.board:
+            return False
+        self.board = board
+        self.score += gained
+        if self.on_move:
+            # Tile trajectories are not tracked on the bitboard
+            result = MoveResult(direction)
+            result.moved = True
+            result.score_delta = gained
+            for callback in self.on_move:
+                callback(result)
+        return True
+
+    def check_game_over(self):
+        """Checks if no moves are left."""
+        return self.legal_moves == 0
+
+    def check_win(self):
+        """Check if the player has reached 2048."""
+        return max_rank(self.board) >= 11
@@ -0,0 +1,331 @@
+import random
+from utils.config import GRID_SIZE
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+# Legal-move bitmask flags, one per direction
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+MOVE_UP = 4
+MOVE_DOWN = 8
+DIRECTION_BITS = {
+    "left": MOVE_LEFT,
+    "right": MOVE_RIGHT,
+    "up": MOVE_UP,
+    "down": MOVE_DOWN,
+}
+
+
+class MoveResult:
+    """Everything a single move did, worked out in one pass over the grid.
+
+    tiles holds a (from_pos, to_pos, value, merged) entry for every tile that
+    moved or merged, with value being the tile's value after the move; both
+    halves of a merge are listed. merges holds (pos, value) for each merged
+    tile and spawn the (pos, value) of the tile added after the move, if any.
+    """
+
+    def __init__(self, direction):
+        self.direction = direction
+        self.moved = False
+        self.score_delta = 0
+        self.tiles = []
+        self.merges = []
+        self.spawn = None
+
+    def __bool__(self):
+        return self.moved
+
+
+class GameCore:
+    """Pure 2048 game logic with no pygame, animation or particle objects.
+
+    Visual layers subscribe to moves and spawns through on_move and on_spawn.
+    """
+
+    def __init__(self, seed=None, size=GRID_SIZE):
+        if size < 2:
+            raise ValueError("The grid must be at least 2x2")
+        self.size = size
+        self.rng = random.Random(seed)
+        self.score = 0
+        self._lines = self._build_lines()
+        self.grid = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        self.last_move = None
+
+        # Event subscribers
+        self.on_move = []   # callback(result)
+        self.on_spawn = []  # callback(pos, value)
+
+    @property
+    def grid(self):
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        self._grid = grid
+        self._rebuild_index()
+
+    @property
+    def state_size(self):
+        """Length in bytes of a packed state"""
+        return self.size * self.size
+
+    def pack_state(self):
+        """Pack the grid into bytes, one log2 rank per cell"""
+        return bytes(value.bit_length() - 1 if value else 0 for row in self._grid for value in row)
+
+    def unpack_state(self, state, score):
+        """Restore a grid packed by pack_state along with its score"""
+        size = self.size
+        self.grid = [[1 << rank if rank else 0 for rank in state[i * size:(i + 1) * size]] for i in range(size)]
+        self.score = score
+        self.last_move = None
+
+    def seed(self, seed=None):
+        """Re-seed the tile spawning RNG"""
+        self.rng.seed(seed)
+
+    def reset(self):
+        """Reset the grid and score and add the two starting tiles"""
+        self.grid = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        self.score = 0
+        self.last_move = None
+        self.add_new_tile()
+        self.add_new_tile()
+
+    def _build_lines(self):
+        """Precompute, per direction, the cells of every line ordered from
+        the edge the tiles move towards"""
+        n = self.size
+        return {
+            "left": [[(k, t) for t in range(n)] for k in range(n)],
+            "right": [[(k, n - 1 - t) for t in range(n)] for k in range(n)],
+            "up": [[(t, k) for t in range(n)] for k in range(n)],
+            "down": [[(n - 1 - t, k) for t in range(n)] for k in range(n)],
+        }
+
+    # Incremental indexes
+
+    def _rebuild_index(self):
+        """Rebuild the empty-cell index, max tile and line masks from scratch"""
+        size = self.size
+        self._empty = []
+        self._slot = [-1] * (size * size)  # Position of each cell in _empty
+        self.max_tile = 0
+        for i, row in enumerate(self._grid):
+            for j, value in enumerate(row):
+                if value == 0:
+                    self._mark_empty(i * size + j)
+                elif value > self.max_tile:
+                    self.max_tile = value
+
+        self._row_masks = [0] * size
+        self._col_masks = [0] * size
+        self._move_counts = [0, 0, 0, 0]  # Lines able to move left, right, up, down
+        for k in range(size):
+            self._update_row(k)
+            self._update_col(k)
+        self._update_legal_moves()
+
+    def _mark_empty(self, cell):
+        if self._slot[cell] < 0:
+            self._slot[cell] = len(self._empty)
+            self._empty.append(cell)
+
+    def _mark_filled(self, cell):
+        slot = self._slot[cell]
+        if slot >= 0:
+            # Swap-remove so that the index stays dense
+            last = self._empty.pop()
+            if last != cell:
+                self._empty[slot] = last
+                self._slot[last] = slot
+            self._slot[cell] = -1
+
+    @staticmethod
+    def _line_mask(line):
+        """Return bit 1 if the line can move towards its start, bit 2 if it
+        can move towards its end"""
+        mask = 0
+        for k in range(len(line) - 1):
+            a, b = line[k], line[k + 1]
+            if a == b:
+                if a:
+                    return 3
+            elif a == 0:
+                mask |= 1
+            elif b == 0:
+                mask |= 2
+            if mask == 3:
+                break
+        return mask
+
+    def _set_line_mask(self, masks, k, mask, first_bit):
+        old = masks[k]
+        if old == mask:
+            return
+        masks[k] = mask
+        counts = self._move_counts
+        for bit in (0, 1):
+            had, has = old >> bit & 1, mask >> bit & 1
+            if had != has:
+                counts[first_bit + bit] += 1 if has else -1
+
+    def _update_row(self, i):
+        self._set_line_mask(self._row_masks, i, self._line_mask(self._grid[i]), 0)
+
+    def _update_col(self, j):
+        column = [row[j] for row in self._grid]
+        self._set_line_mask(self._col_masks, j, self._line_mask(column), 2)
+
+    def _update_legal_moves(self):
+        counts = self._move_counts
+        self.legal_moves = (
+            (MOVE_LEFT if counts[0] else 0)
+            | (MOVE_RIGHT if counts[1] else 0)
+            | (MOVE_UP if counts[2] else 0)
+            | (MOVE_DOWN if counts[3] else 0)
+        )
+
+    # Game rules
+
+    def empty_count(self):
+        """Number of empty cells on the grid"""
+        return len(self._empty)
+
+    def empty_cells(self):
+        """Return the (row, col) of every empty cell"""
+        return [divmod(cell, self.size) for cell in self._empty]
+
+    def add_new_tile(self):
+        """Add a new tile (2 or 4) to a random empty cell.
+
+        Returns the (pos, value) of the new tile, or None if the grid is full.
+        """
+        if not self._empty:
+            return None
+        cell = self._empty[self.rng.randrange(len(self._empty))]
+        value = 2 if self.rng.random() < 0.9 else 4  # 90% chance of 2, 10% of 4
+        return self.place_tile(divmod(cell, self.size), value)
+
+    def place_tile(self, pos, value):
+        """Put a tile with the given value on an empty cell"""
+        i, j = pos
+        self._grid[i][j] = value
+        self._mark_filled(i * self.size + j)
+        if value > self.max_tile:
+            self.max_tile = value
+
+        # Only the new tile's row and column can have changed
+        self._update_row(i)
+        self._update_col(j)
+        self._update_legal_moves()
+
+        if self.last_move is not None and self.last_move.spawn is None:
+            self.last_move.spawn = ((i, j), value)
+        for callback in self.on_spawn:
+            callback((i, j), value)
+        return (i, j), value
+
+    def move(self, direction):
+        """Move tiles in the given direction and merge equal tiles.
+
+        Returns a MoveResult, which is truthy if anything moved.
+        """
+        result = MoveResult(direction)
+        bit = DIRECTION_BITS.get(direction, 0)
+        if not self.legal_moves & bit:
+            return result
+
+        size = self.size
+        grid = self._grid
+        new_grid = [row[:] for row in grid]
+        tiles = result.tiles
+        merges = result.merges
+        gained = 0
+        changed_rows = set()
+        changed_cols = set()
+
+        # Lines that cannot move this way are left untouched
+        line_masks = self._row_masks if bit & (MOVE_LEFT | MOVE_RIGHT) else self._col_masks
+        line_bit = 1 if bit & (MOVE_LEFT | MOVE_UP) else 2
+
+        # Walk each line once from the destination edge. A tile is held back
+        # until the next tile shows whether the two merge or it just slides.
+        for k, cells in enumerate(self._lines[direction]):
+            if not line_masks[k] & line_bit:
+                continue
+            write = 0
+            held_value = 0
+            held_pos = None
+            for pos in cells:
+                value = grid[pos[0]][pos[1]]
+                if not value:
+                    continue
+                if value == held_value:
+                    dest = cells[write]
+                    merged = value * 2
+                    new_grid[dest[0]][dest[1]] = merged
+                    gained += merged
+                    tiles.append((held_pos, dest, merged, True))
+                    tiles.append((pos, dest, merged, True))
+                    merges.append((dest, merged))
+                    if merged > self.max_tile:
+                        self.max_tile = merged
+                    write += 1
+                    held_value = 0
+                else:
+                    if held_value:
+                        dest = cells[write]
+                        new_grid[dest[0]][dest[1]] = held_value
+                        if dest != held_pos:
+                            tiles.append((held_pos, dest, held_value, False))
+                        write += 1
+                    held_value = value
+                    held_pos = pos
+            if held_value:
+                dest = cells[write]
+                new_grid[dest[0]][dest[1]] = held_value
+                if dest != held_pos:
+                    tiles.append((held_pos, dest, held_value, False))
+                write += 1
+
+            # Everything past the last written cell is now empty
+            for t, (r, c) in enumerate(cells):
+                if t >= write:
+                    new_grid[r][c] = 0
+                if new_grid[r][c] != grid[r][c]:
+                    changed_rows.add(r)
+                    changed_cols.add(c)
+                    if t < write:
+                        self._mark_filled(r * size + c)
+                    else:
+                        self._mark_empty(r * size + c)
+
+        self._grid = new_grid
+        for i in changed_rows:
+            self._update_row(i)
+        for j in changed_cols:
+            self._update_col(j)
+        self._update_legal_moves()
+
+        result.moved = True
+        result.score_delta = gained
+        self.score += gained
+        self.last_move = result
+        for callback in self.on_move:
+            callback(result)
+        return result
+
+    def can_move(self, direction):
+        """Check whether a move in the given direction would change the grid"""
+        return bool(self.legal_moves & DIRECTION_BITS.get(direction, 0))
+
+    def check_game_over(self):
+        """Checks if no moves are left."""
+        return self.legal_moves == 0
+
+    def check_win(self):
+        """Check if the player has reached 2048."""
+        return self.max_tile >= 2048
@@ -1,254 +1,148 @@
-import random
-from utils.config import GRID_SIZE, TILE_SIZE
-from utils.animations import TileAnimation, NewTileAnimation, Particle
+from utils.config import WIDTH, GRID_SIZE, PARTICLE_BUDGET
+from utils.animations import AnimationTimeline
+from utils.particles import ParticleSystem
+from models.core import GameCore
 
 class GameGrid:
-    def __init__(self):
-        self.grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.score = 0
-        self.tile_animations = []
-        self.new_tile_animations = []
-        self.particles = []
-        
+    """Animated game grid for the pygame front end.
+
+    The rules live in GameCore; this class subscribes to its move and spawn
+    events and turns them into tile animations and merge particles.
+    """
+
+    def __init__(self, seed=None, size=GRID_SIZE):
+        self.core = GameCore(seed, size)
+        self.size = size
+        self.tile_size = WIDTH // size
+        self.core.on_move.append(self.handle_move)
+        self.core.on_spawn.append(self.handle_spawn)
+        self.timeline = AnimationTimeline()
+        self.particles = ParticleSystem(PARTICLE_BUDGET, seed)
+        self.tile_colors = {}
+
+    @property
+    def tile_animations(self):
+        """(from_pos, to_pos, value, merged, t, scale) per moving tile"""
+        return self.timeline.moves
+
+    @property
+    def new_tile_animations(self):
+        """(pos, value, scale) per appearing tile"""
+        return self.timeline.spawns
+
+    @property
+    def on_move(self):
+        return self.core.on_move
+
+    @property
+    def on_spawn(self):
+        return self.core.on_spawn
+
+    @property
+    def grid(self):
+        return self.core.grid
+
+    @grid.setter
+    def grid(self, grid):
+        self.core.grid = grid
+
+    @property
+    def score(self):
+        return self.core.score
+
+    @score.setter
+    def score(self, score):
+        self.core.score = score
+
+    @property
+    def last_move(self):
+        return self.core.last_move
+
+    @property
+    def max_tile(self):
+        return self.core.max_tile
+
+    @property
+    def legal_moves(self):
+        return self.core.legal_moves
+
+    def can_move(self, direction):
+        """Check whether a move in the given direction would change the grid"""
+        return self.core.can_move(direction)
+
+    @property
+    def state_size(self):
+        return self.core.state_size
+
+    def pack_state(self):
+        """Pack the grid into bytes for the undo history"""
+        return self.core.pack_state()
+
+    def unpack_state(self, state, score):
+        """Restore a packed grid and drop any animations in flight"""
+        self.timeline.clear()
+        self.core.unpack_state(state, score)
+
+    def seed(self, seed=None):
+        """Re-seed the tile spawning RNG"""
+        self.core.seed(seed)
+
     def reset(self):
         """Reset the game grid and score"""
-        self.grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.score = 0
-        self.tile_animations = []
-        self.new_tile_animations = []
-        self.particles = []
-        self.add_new_tile()
-        self.add_new_tile()
-    
+        self.timeline.clear()
+        self.particles.clear()
+        self.core.reset()
+
     def add_new_tile(self):
         """Add a new tile (2 or 4) to a random empty cell"""
-        empty_cells = [(i, j) for i in range(GRID_SIZE) for j in range(GRID_SIZE) if self.grid[i][j] == 0]
-        if empty_cells:
-            i, j = random.choice(empty_cells)
-            value = 2 if random.random() < 0.9 else 4  # 90% chance of 2, 10% of 4
-            self.grid[i][j] = value
-            self.new_tile_animations.append(NewTileAnimation((i, j), value))
-    
+        return self.core.add_new_tile()
+
+    def place_tile(self, pos, value):
+        """Put a specific tile on an empty cell, e.g. when replaying a game"""
+        return self.core.place_tile(pos, value)
+
+    def handle_spawn(self, pos, value):
+        """Animate a tile spawned by the core"""
+        self.timeline.add_spawn(pos, value)
+
+    def handle_move(self, result):
+        """Animate the tile movements and merges of a move made by the core"""
+        for from_pos, to_pos, value, merged in result.tiles:
+            self.timeline.add_move(from_pos, to_pos, value, merged)
+        for (row, col), value in result.merges:
+            self.create_merge_particles(row, col, value, self.tile_colors)
+
     def create_merge_particles(self, row, col, value, tile_colors):
         """Create particles when tiles merge"""
         # Get the tile color based on its value
         color = tile_colors.get(value, (200, 200, 200))
-        
+
         # Position in screen coordinates
-        x = col * TILE_SIZE + TILE_SIZE // 2
-        y = row * TILE_SIZE + 100 + TILE_SIZE // 2
-        
+        x = col * self.tile_size + self.tile_size // 2
+        y = row * self.tile_size + 100 + self.tile_size // 2
+
         # Create particles
-        for _ in range(20):  # Number of particles
-            self.particles.append(Particle(x, y, color, value))
-    
-    def update_animations(self):
-        """Update all animations and remove completed ones"""
-        # Update tile movement animations
-        i = 0
-        while i < len(self.tile_animations):
-            if self.tile_animations[i].update():
-                self.tile_animations.pop(i)
-            else:
-                i += 1
-        
-        # Update new tile animations
-        i = 0
-        while i < len(self.new_tile_animations):
-            if self.new_tile_animations[i].update():
-                self.new_tile_animations.pop(i)
-            else:
-                i += 1
-    
-    def update_particles(self):
+        self.particles.emit(x, y, color, 20)
+
+    def update_animations(self, dt=1 / 60):
+        """Advance all animations by dt seconds and drop completed ones"""
+        self.timeline.update(dt)
+
+    def update_particles(self, dt=1 / 60):
         """Update all particles and remove dead ones"""
-        i = 0
-        while i < len(self.particles):
-            if self.particles[i].update():
-                i += 1
-            else:
-                self.particles.pop(i)
-    
-    def transpose_grid(self, grid):
-        """Transpose the grid (swap rows and columns)"""
-        return [list(row) for row in zip(*grid)]
-    
-    def reverse_rows(self, grid):
-        """Reverse each row in the grid"""
-        return [row[::-1] for row in grid]
-    
-    def move_left(self, tile_colors):
-        """Move tiles left and merge equal tiles"""
-        moved = False
-        new_grid = [row[:] for row in self.grid]  # Create a copy
-        merged = [[False for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        
-        for i in range(GRID_SIZE):
-            # Collect non-zero tiles
-            row = [tile for tile in new_grid[i] if tile != 0]
-            
-            # Merge adjacent same-value tiles
-            j = 0
-            while j < len(row) - 1:
-                if row[j] == row[j + 1]:
-                    row[j] *= 2
-                    self.score += row[j]
-                    row.pop(j + 1)
-                    merged[i][j] = True
-                    moved = True
-                    # Create particles for the merge
-                    self.create_merge_particles(i, j, row[j], tile_colors)
-                j += 1
-            
-            # Fill remaining spots with zeros
-            row.extend([0] * (GRID_SIZE - len(row)))
-            
-            # Check if there was movement
-            if new_grid[i] != row:
-                moved = True
-            
-            # Create animations for this row
-            for j in range(GRID_SIZE):
-                if row[j] != 0:
-                    # Find original position
-                    found = False
-                    for k in range(GRID_SIZE):
-                        if new_grid[i][k] == row[j] and not found:
-                            if merged[i][j] and k > j:
-                                # If this was merged, create two animations: one for each original tile
-                                self.tile_animations.append(TileAnimation((i, k), (i, j), row[j], merged=True))
-                                
-                                # Find the second tile that was merged (first one after k with same value)
-                                for l in range(k+1, GRID_SIZE):
-                                    if new_grid[i][l] == new_grid[i][k]:
-                                        self.tile_animations.append(TileAnimation((i, l), (i, j), row[j], merged=True))
-                                        break
-                                found = True
-                            elif k != j:  # Only animate if position changed
-                                self.tile_animations.append(TileAnimation((i, k), (i, j), row[j]))
-                                found = True
-            
-            new_grid[i] = row
-        
-        if moved:
-            self.grid = new_grid
-        
-        return moved
-    
-    def move_right(self, tile_colors):
-        """Move tiles right by reversing, moving left, then reversing back"""
-        # Clear previous animations
-        self.tile_animations = []
-        
-        # Reverse the grid for right movement
-        reversed_grid = self.reverse_rows(self.grid)
-        self.grid = reversed_grid
-        
-        # Move left
-        moved = self.move_left(tile_colors)
-        
-        # Reverse back
-        self.grid = self.reverse_rows(self.grid)
-        
-        # Adjust animation data for the reverse transformation
-        for anim in self.tile_animations:
-            anim.from_pos = (anim.from_pos[0], GRID_SIZE - 1 - anim.from_pos[1])
-            anim.to_pos = (anim.to_pos[0], GRID_SIZE - 1 - anim.to_pos[1])
-        
-        return moved
-    
-    def move_up(self, tile_colors):
-        """Move tiles up by transposing, moving left, then transposing back"""
-        # Clear previous animations
-        self.tile_animations = []
-        
-        # Transpose the grid for up movement
-        transposed = self.transpose_grid(self.grid)
-        self.grid = transposed
-        
-        # Move left
-        moved = self.move_left(tile_colors)
-        
-        # Transpose back
-        self.grid = self.transpose_grid(self.grid)
-        
-        # Adjust animation data for the transpose transformation
-        for anim in self.tile_animations:
-            anim.from_pos = (anim.from_pos[1], anim.from_pos[0])
-            anim.to_pos = (anim.to_pos[1], anim.to_pos[0])
-        
-        return moved
-    
-    def move_down(self, tile_colors):
-        """Move tiles down by transposing, moving right, then transposing back"""
-        # Clear previous animations
-        self.tile_animations = []
-        
-        # Transpose the grid
-        transposed = self.transpose_grid(self.grid)
-        self.grid = transposed
-        
-        # Reverse for right movement
-        self.grid = self.reverse_rows(self.grid)
-        
-        # Move left
-        moved = self.move_left(tile_colors)
-        
-        # Undo the transformations
-        self.grid = self.reverse_rows(self.grid)
-        self.grid = self.transpose_grid(self.grid)
-        
-        # Adjust animation data for the transformations
-        for anim in self.tile_animations:
-            temp = anim.from_pos[0]
-            anim.from_pos = (GRID_SIZE - 1 - anim.from_pos[1], temp)
-            temp = anim.to_pos[0]
-            anim.to_pos = (GRID_SIZE - 1 - anim.to_pos[1], temp)
-        
-        return moved
-    
+        self.particles.update(dt)
+
     def move_tiles(self, direction, tile_colors):
         """Moves tiles in the specified direction and merges equal tiles."""
-        # Clear previous animations
-        self.tile_animations = []
-        
-        if direction == "left":
-            return self.move_left(tile_colors)
-        elif direction == "right":
-            return self.move_right(tile_colors)
-        elif direction == "up":
-            return self.move_up(tile_colors)
-        elif direction == "down":
-            return self.move_down(tile_colors)
-        
-        return False
-    
+        # Fast-forward animations still in flight from the previous move
+        self.timeline.clear()
+        self.tile_colors = tile_colors
+        return self.core.move(direction)
+
     def check_game_over(self):
         """Checks if no moves are left."""
-        # Check for empty cells
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                if self.grid[i][j] == 0:
-                    return False
-        
-        # Check for possible merges horizontally
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE - 1):
-                if self.grid[i][j] == self.grid[i][j + 1]:
-                    return False
-        
-        # Check for possible merges vertically
-        for i in range(GRID_SIZE - 1):
-            for j in range(GRID_SIZE):
-                if self.grid[i][j] == self.grid[i + 1][j]:
-                    return False
-        
-        return True
-    
+        return self.core.check_game_over()
+
     def check_win(self):
         """Check if the player has reached 2048."""
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                if self.grid[i][j] >= 2048:
-                    return True
-        return False 
\ No newline at end of file
+        return self.core.check_win()
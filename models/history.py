@@ -0,0 +1,103 @@
+import struct
+
+SCORE = struct.Struct("<Q")
+
+
+class RecordRing:
+    """Stack of fixed-size records stored in one preallocated bytearray.
+
+    When the ring is full, pushing a record overwrites the oldest one.
+    """
+
+    def __init__(self, record_size, capacity):
+        self.record_size = record_size
+        self.capacity = capacity
+        self.buffer = bytearray(record_size * capacity)
+        self.start = 0  # Slot of the oldest record
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, record):
+        if self.capacity == 0:
+            return
+        if self.count < self.capacity:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            # Evict the oldest record
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        offset = slot * self.record_size
+        self.buffer[offset:offset + self.record_size] = record
+
+    def pop(self):
+        """Remove and return the newest record"""
+        if self.count == 0:
+            return None
+        self.count -= 1
+        offset = (self.start + self.count) % self.capacity * self.record_size
+        return bytes(self.buffer[offset:offset + self.record_size])
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+
+class UndoHistory:
+    """Bounded multi-level undo/redo of packed game states.
+
+    Each entry is a grid's packed state followed by the score as a 64-bit
+    integer, so a 4x4 game costs 16-24 bytes per move. Both stacks live in
+    preallocated buffers that together stay within max_bytes, dropping the
+    oldest entries first.
+    """
+
+    def __init__(self, state_size, max_bytes=512 * 1024):
+        self.state_size = state_size
+        record_size = state_size + SCORE.size
+        capacity = max(1, max_bytes // (2 * record_size))
+        self.undo_stack = RecordRing(record_size, capacity)
+        self.redo_stack = RecordRing(record_size, capacity)
+
+    def _pack(self, state, score):
+        return state + SCORE.pack(score)
+
+    def _unpack(self, record):
+        return record[:self.state_size], SCORE.unpack_from(record, self.state_size)[0]
+
+    def record(self, state, score):
+        """Remember the state before a move; a new move discards the redo stack"""
+        self.undo_stack.push(self._pack(state, score))
+        self.redo_stack.clear()
+
+    def can_undo(self):
+        return len(self.undo_stack) > 0
+
+    def can_redo(self):
+        return len(self.redo_stack) > 0
+
+    def undo(self, state, score):
+        """Step back from the given current state; returns (state, score) or None"""
+        record = self.undo_stack.pop()
+        if record is None:
+            return None
+        self.redo_stack.push(self._pack(state, score))
+        return self._unpack(record)
+
+    def redo(self, state, score):
+        """Step forward again after an undo; returns (state, score) or None"""
+        record = self.redo_stack.pop()
+        if record is None:
+            return None
+        self.undo_stack.push(self._pack(state, score))
+        return self._unpack(record)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def memory_usage(self):
+        """Bytes held by both stacks"""
+        return len(self.undo_stack.buffer) + len(self.redo_stack.buffer)
@@ -0,0 +1,185 @@
+import mmap
+import time
+import struct
+import argparse
+from models.core import GameCore
+from models.recording import (
+    RECORD, NO_MOVE, MAGIC as LOG_MAGIC, RecordedGame, read_log, replay_bitboard, replay_core, ReplayError,
+)
+
+# An indexed history file holds one game: a header (magic, grid size, RNG
+# seed), the game's 3-byte records exactly as in a log, a keyframe of the
+# full state every `interval` moves, and a fixed-size footer. Readers start
+# from the footer, so nothing before the requested keyframe is ever parsed.
+MAGIC = b"2048HST1"
+HEADER = struct.Struct("<8sBQ")
+# Record index the keyframe resumes from and the score so far; followed by
+# the state packed as by GameCore.pack_state
+KEYFRAME = struct.Struct("<IQ")
+# Keyframe offset, keyframe count, keyframe interval, move count, magic
+FOOTER = struct.Struct("<QIII8s")
+
+KEYFRAME_INTERVAL = 256
+
+
+def build_index(game, interval=KEYFRAME_INTERVAL):
+    """Encode a recorded game as an indexed history file.
+
+    Keyframe k holds the state after k * interval moves and their spawns.
+    """
+    core = GameCore(game.seed, game.size)
+    keyframes = bytearray()
+
+    # The starting spawns come first, then every record is one move
+    record = 0
+    for code, _ in game.iter_records():
+        if not code & NO_MOVE:
+            break
+        record += 1
+    core, _ = replay_core(game, core, 0, 0)
+
+    count = 0
+    moves = 0
+    while True:
+        keyframes.extend(KEYFRAME.pack(record, core.score) + core.pack_state())
+        count += 1
+        core, applied = replay_core(game, core, record, interval)
+        moves += applied
+        record += applied
+        if applied < interval:
+            break
+
+    records = bytes(game.records[:len(game) * RECORD.size])
+    keyframe_offset = HEADER.size + len(records)
+    return b"".join((
+        HEADER.pack(MAGIC, game.size, game.seed),
+        records,
+        bytes(keyframes),
+        FOOTER.pack(keyframe_offset, count, interval, moves, MAGIC),
+    ))
+
+
+def write_index(path, game, interval=KEYFRAME_INTERVAL):
+    with open(path, "wb") as file:
+        file.write(build_index(game, interval))
+
+
+class IndexedGame:
+    """Random access to the positions of one game.
+
+    Seeking loads the nearest keyframe at or before the requested move and
+    re-simulates at most interval - 1 moves from it, so latency does not
+    depend on how long the game is. The buffer is usually a read-only mmap
+    of a history file.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        magic, self.size, self.seed = HEADER.unpack_from(buffer, 0)
+        keyframe_offset, self.keyframe_count, self.interval, self.moves, end_magic = \
+            FOOTER.unpack_from(buffer, len(buffer) - FOOTER.size)
+        if magic != MAGIC or end_magic != MAGIC:
+            raise ReplayError("Not an indexed game history")
+        self.state_size = self.size * self.size
+        self.keyframe_size = KEYFRAME.size + self.state_size
+        self.keyframe_offset = keyframe_offset
+        self.records = memoryview(buffer)[HEADER.size:keyframe_offset]
+        self._mmap = None
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a history file"""
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        game = cls(buffer)
+        game._mmap = buffer
+        return game
+
+    def __len__(self):
+        return len(self.records) // RECORD.size
+
+    def record(self, index):
+        """Return the (code, cell) record at an index"""
+        return RECORD.unpack_from(self.records, index * RECORD.size)
+
+    def keyframe(self, index):
+        """Return (record index, score, packed state) of a keyframe"""
+        offset = self.keyframe_offset + index * self.keyframe_size
+        record, score = KEYFRAME.unpack_from(self.buffer, offset)
+        start = offset + KEYFRAME.size
+        return record, score, bytes(self.buffer[start:start + self.state_size])
+
+    def seek(self, move):
+        """Return (packed state, score, record index) after a number of moves"""
+        move = max(0, min(move, self.moves))
+        index = min(move // self.interval, self.keyframe_count - 1)
+        record, score, state = self.keyframe(index)
+        remaining = move - index * self.interval
+        if remaining:
+            # Every record after the keyframe's is exactly one move, so only
+            # the next `remaining` records are handed over, whatever follows
+            span = RecordedGame(self.size, self.seed, self.records[record * RECORD.size:(record + remaining) * RECORD.size])
+            if self.size == 4:
+                board = 0
+                for cell, rank in enumerate(state):
+                    board |= rank << (4 * cell)
+                board, score, _ = replay_bitboard(span, board, score, 0, remaining)
+                state = bytes((board >> shift) & 0xF for shift in range(0, 64, 4))
+            else:
+                core = GameCore(self.seed, self.size)
+                core.unpack_state(state, score)
+                core, _ = replay_core(span, core, 0, remaining)
+                state, score = core.pack_state(), core.score
+        return state, score, record + remaining
+
+    def close(self):
+        self.records.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+
+def read_game(path, game_index=0):
+    """One game of a plain log, by its index in the log"""
+    games = read_log(path)
+    if not -len(games) <= game_index < len(games):
+        raise ReplayError(f"{path} holds {len(games)} games; there is no game {game_index}")
+    return games[game_index]
+
+
+def open_game(path, game_index=0, interval=KEYFRAME_INTERVAL):
+    """Open a history file, or index one game of a plain log in memory"""
+    with open(path, "rb") as file:
+        magic = file.read(len(MAGIC))
+    if magic == MAGIC:
+        return IndexedGame.open(path)
+    if magic != LOG_MAGIC:
+        raise ReplayError(f"{path} is neither a game log nor a game history")
+    return IndexedGame(build_index(read_game(path, game_index), interval))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a keyframe-indexed history of a recorded game")
+    parser.add_argument("log", help="game log written with --record")
+    parser.add_argument("output", help="history file to write")
+    parser.add_argument("--game", type=int, default=0, help="index of the game in the log (default: 0)")
+    parser.add_argument("--interval", type=int, default=KEYFRAME_INTERVAL,
+                        help=f"moves between keyframes (default: {KEYFRAME_INTERVAL})")
+    args = parser.parse_args()
+
+    try:
+        game = read_game(args.log, args.game)
+    except ReplayError as error:
+        parser.error(str(error))
+    write_index(args.output, game, args.interval)
+    game = IndexedGame.open(args.output)
+    start = time.perf_counter()
+    for move in range(0, game.moves + 1, max(1, game.moves // 100)):
+        game.seek(move)
+    elapsed = time.perf_counter() - start
+    print(f"{args.output}: {game.moves} moves, {game.keyframe_count} keyframes, "
+          f"{elapsed / min(game.moves + 1, 101) * 1000:.2f} ms/seek")
+    game.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import sys
+import time
+import struct
+from models.core import GameCore, DIRECTIONS
+
+# A log is a sequence of games. Each game starts with a header (magic, grid
+# size, RNG seed) followed by fixed 3-byte records: a code byte and the
+# spawned tile's cell index (row * size + col).
+MAGIC = b"2048LOG1"
+HEADER = struct.Struct("<8sBQ")
+RECORD = struct.Struct("<BH")
+
+# Record code bits; the low two bits are the index into DIRECTIONS
+DIRECTION_MASK = 0x03
+SPAWN_FOUR = 0x04  # The spawned tile is a 4 rather than a 2
+NO_MOVE = 0x08     # Spawn only, e.g. the two starting tiles
+NO_SPAWN = 0x10    # Move without a following spawn
+
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Nibble mask, 2 tile and 4 tile of each cell of a 4x4 bitboard
+BITBOARD_CELLS = tuple(0xF << (cell * 4) for cell in range(16))
+BITBOARD_TWOS = tuple(1 << (cell * 4) for cell in range(16))
+BITBOARD_FOURS = tuple(2 << (cell * 4) for cell in range(16))
+
+
+class ReplayError(ValueError):
+    """Raised when a log does not follow the game rules"""
+
+
+class GameRecorder:
+    """Append-only binary recorder of moves and spawns.
+
+    Subscribes to a game grid's on_move and on_spawn events. A move is held
+    back until its spawn arrives so that the two share one record.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "ab")
+        self.pending = None  # Direction code of a move waiting for its spawn
+        self.size = 0
+
+    def attach(self, game_grid):
+        game_grid.on_move.append(self.handle_move)
+        game_grid.on_spawn.append(self.handle_spawn)
+
+    def start_game(self, size, seed):
+        """Begin a new game in the log"""
+        self._flush_pending()
+        self.size = size
+        self.file.write(HEADER.pack(MAGIC, size, seed))
+        self.file.flush()
+
+    def handle_move(self, result):
+        self._flush_pending()
+        self.pending = DIRECTION_CODES[result.direction]
+
+    def handle_spawn(self, pos, value):
+        code = NO_MOVE if self.pending is None else self.pending
+        if value == 4:
+            code |= SPAWN_FOUR
+        self.file.write(RECORD.pack(code, pos[0] * self.size + pos[1]))
+        self.pending = None
+
+    def _flush_pending(self):
+        if self.pending is not None:
+            self.file.write(RECORD.pack(self.pending | NO_SPAWN, 0))
+            self.pending = None
+
+    def close(self):
+        self._flush_pending()
+        self.file.close()
+
+
+class RecordedGame:
+    """One game read back from a log"""
+
+    def __init__(self, size, seed, records):
+        self.size = size
+        self.seed = seed
+        self.records = records  # Raw record bytes
+
+    def __len__(self):
+        return len(self.records) // RECORD.size
+
+    def iter_records(self):
+        """Yield (code, cell) for every record"""
+        return RECORD.iter_unpack(self.records)
+
+
+def read_log(path):
+    """Return every game stored in a log file"""
+    with open(path, "rb") as file:
+        data = file.read()
+    return parse_log(data)
+
+
+def parse_log(data):
+    """Split raw log bytes into games"""
+    games = []
+    offset = 0
+    while len(data) - offset >= HEADER.size:
+        magic, size, seed = HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise ReplayError(f"Bad game header at byte {offset}")
+        offset += HEADER.size
+
+        # A record's code byte never matches the magic's first byte, so the
+        # next header is the first copy of the magic on a record boundary
+        end = data.find(MAGIC, offset)
+        while end != -1 and (end - offset) % RECORD.size:
+            end = data.find(MAGIC, end + 1)
+        if end == -1:
+            end = len(data)
+        # Drop a record torn by a crash mid-write
+        usable = end - (end - offset) % RECORD.size
+        games.append(RecordedGame(size, seed, data[offset:usable]))
+        offset = end
+    return games
+
+
+def replay_bitboard(game, board=0, score=0, start=0, limit=None):
+    """Re-simulate a 4x4 game on the bitboard; returns (board, score, moves).
+
+    Playback begins at record index start from the given board and score,
+    and stops once limit moves (with their spawns) have been applied.
+    """
+    from models import bitboard  # Imported here, as it precomputes its row tables
+    moves = tuple(bitboard.MOVES[direction] for direction in DIRECTIONS)
+    # Records are decoded lazily, so a limited replay costs only what it plays
+    count = 0
+    for code, cell in RECORD.iter_unpack(memoryview(game.records)[start * RECORD.size:]):
+        if not code & NO_MOVE:
+            if count == limit:
+                break
+            new_board, gained = moves[code & DIRECTION_MASK](board)
+            if new_board == board:
+                raise ReplayError(f"Move {count} ({DIRECTIONS[code & DIRECTION_MASK]}) does not change the board")
+            board = new_board
+            score += gained
+            count += 1
+        if not code & NO_SPAWN:
+            if cell >= 16:
+                raise ReplayError(f"Spawn after move {count} is outside the 4x4 board")
+            if board & BITBOARD_CELLS[cell]:
+                raise ReplayError(f"Spawn after move {count} lands on an occupied cell")
+            board |= (BITBOARD_FOURS if code & SPAWN_FOUR else BITBOARD_TWOS)[cell]
+    return board, score, count
+
+
+def replay_core(game, core=None, start=0, limit=None):
+    """Re-simulate a game of any size through GameCore; returns (core, moves).
+
+    Takes the same start and limit as replay_bitboard, continuing from the
+    given core if there is one.
+    """
+    if core is None:
+        core = GameCore(game.seed, game.size)
+    count = 0
+    for code, cell in RECORD.iter_unpack(game.records[start * RECORD.size:]):
+        if not code & NO_MOVE:
+            if count == limit:
+                break
+            direction = DIRECTIONS[code & DIRECTION_MASK]
+            if not core.move(direction):
+                raise ReplayError(f"Move {count} ({direction}) does not change the grid")
+            count += 1
+        if not code & NO_SPAWN:
+            pos = divmod(cell, game.size)
+            if core.grid[pos[0]][pos[1]]:
+                raise ReplayError(f"Spawn after move {count} lands on an occupied cell")
+            core.place_tile(pos, 4 if code & SPAWN_FOUR else 2)
+    return core, count
+
+
+def replay(game):
+    """Re-simulate a recorded game; returns (grid, score, moves)"""
+    if game.size == 4:
+        from models.bitboard import to_grid
+        board, score, count = replay_bitboard(game)
+        return to_grid(board), score, count
+    core, count = replay_core(game)
+    return core.grid, core.score, count
+
+
+def main(paths):
+    """Replay every game in the given logs and report throughput"""
+    import models.bitboard  # Build the row tables before the clock starts
+    total_moves = 0
+    start = time.perf_counter()
+    for path in paths:
+        for index, game in enumerate(read_log(path)):
+            grid, score, moves = replay(game)
+            total_moves += moves
+            best = max(value for row in grid for value in row)
+            print(f"{path} game {index}: {game.size}x{game.size}, seed {game.seed}, "
+                  f"{moves} moves, score {score}, max tile {best}")
+    elapsed = time.perf_counter() - start
+    if elapsed > 0:
+        print(f"replayed {total_moves} moves in {elapsed:.3f}s ({total_moves / elapsed:.0f} moves/sec)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
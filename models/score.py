@@ -1,9 +1,92 @@
 import os
+import atexit
+import logging
+import threading
+from utils.config import HIGH_SCORE_FILE, HIGH_SCORE_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+def write_atomic(path, text):
+    """Replace a file's contents so that a crash leaves either the old or the
+    new contents, never a truncated file"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    # Make the rename itself durable where directories can be synced
+    if hasattr(os, "O_DIRECTORY"):
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class HighScoreWriter:
+    """Writes the latest saved high score from a background thread"""
+
+    def __init__(self, path=HIGH_SCORE_FILE, interval=HIGH_SCORE_FLUSH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.pending = None  # Newest score not yet written
+        self.flush_requested = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def save(self, score):
+        with self.condition:
+            if self.closed:
+                return
+            self.pending = score
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="high-score-writer", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+
+    def flush(self):
+        """Write the pending score without waiting for the interval"""
+        with self.condition:
+            if self.pending is not None:
+                self.flush_requested = True
+                self.condition.notify()
+
+    def close(self):
+        """Write the pending score and stop the thread"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.flush_requested or self.closed, self.interval)
+                score, self.pending = self.pending, None
+                self.flush_requested = False
+                closed = self.closed
+            if score is not None:
+                self.write(score)
+            if closed:
+                return
+
+    def write(self, score):
+        try:
+            write_atomic(self.path, str(score))
+        except OSError as error:
+            logger.warning("Could not save the high score to %s: %s", self.path, error)
+
 
 class ScoreManager:
-    def __init__(self):
+    def __init__(self, path=HIGH_SCORE_FILE):
+        self.path = path
         self.current_score = 0
         self.best_score = self.load_high_score()
+        self.writer = HighScoreWriter(path)
     
     def update_score(self, score):
         """Update the current score"""
@@ -17,21 +100,24 @@ class ScoreManager:
         self.current_score = 0
     
     def save_high_score(self, score):
-        """Save high score to a file"""
-        try:
-            with open("high_score.txt", "w") as file:
-                file.write(str(score))
-        except:
-            # If there's an error saving, just continue
-            pass
+        """Queue the high score to be written in the background"""
+        self.writer.save(score)
+    
+    def flush(self):
+        """Write a pending high score now, e.g. at game over"""
+        self.writer.flush()
+    
+    def close(self):
+        """Write a pending high score and stop the writer thread"""
+        self.writer.close()
     
     def load_high_score(self):
         """Load high score from file"""
         try:
-            if os.path.exists("high_score.txt"):
-                with open("high_score.txt", "r") as file:
-                    return int(file.read().strip())
+            with open(self.path, "r") as file:
+                return int(file.read().strip())
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as error:
+            logger.warning("Could not read the high score from %s: %s", self.path, error)
             return 0
-        except:
-            # If there's an error loading, return 0
-            return 0 
\ No newline at end of file
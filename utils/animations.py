@@ -1,86 +1,64 @@
-import random
-import pygame
-import math
-from utils.config import TILE_SIZE, GRID_PADDING
+from utils.config import MOVE_ANIMATION_MS, SPAWN_ANIMATION_MS
 
-class TileAnimation:
-    def __init__(self, from_pos, to_pos, value, merged=False):
-        self.from_pos = from_pos  # (row, col)
-        self.to_pos = to_pos  # (row, col)
-        self.value = value
-        self.progress = 0.0
-        self.merged = merged
-        self.scale = 1.0
+class AnimationTimeline:
+    """Tile move and spawn animations advanced by elapsed time"""
 
-    def update(self):
-        if self.progress < 1.0:
-            self.progress += 0.1
-            if self.merged and self.progress > 0.8:
-                self.scale = 1.1 - (self.progress - 0.8) * 0.5
-            return False  # Animation not complete
-        return True  # Animation complete
+    def __init__(self, move_duration=MOVE_ANIMATION_MS / 1000, spawn_duration=SPAWN_ANIMATION_MS / 1000):
+        self.move_duration = move_duration
+        self.spawn_duration = spawn_duration
+        self.time = 0.0
+        self.move_records = []   # (start, from_pos, to_pos, value, merged)
+        self.spawn_records = []  # (start, pos, value)
+        self.moves = []
+        self.spawns = []
 
-    def get_current_position(self):
-        start_x = self.from_pos[1] * TILE_SIZE + GRID_PADDING
-        start_y = self.from_pos[0] * TILE_SIZE + 100
-        end_x = self.to_pos[1] * TILE_SIZE + GRID_PADDING
-        end_y = self.to_pos[0] * TILE_SIZE + 100
-        
-        # Smooth easing function
-        t = self.progress
-        t = 1.0 - (1.0 - t) * (1.0 - t)  # easeOutQuad
-        
-        current_x = start_x + (end_x - start_x) * t
-        current_y = start_y + (end_y - start_y) * t
-        
-        return (current_x, current_y)
+    def add_move(self, from_pos, to_pos, value, merged=False):
+        self.move_records.append((self.time, from_pos, to_pos, value, merged))
+        self.moves.append((from_pos, to_pos, value, merged, 0.0, 1.0))
 
-class NewTileAnimation:
-    def __init__(self, pos, value):
-        self.pos = pos  # (row, col)
-        self.value = value
-        self.progress = 0.0
+    def add_spawn(self, pos, value):
+        start = self.time
+        if self.move_records:
+            start = max(start, self.move_records[-1][0] + self.move_duration)
+        self.spawn_records.append((start, pos, value))
+        self.spawns.append((pos, value, 0.0))
 
-    def update(self):
-        if self.progress < 1.0:
-            self.progress += 0.15
-            return False
-        return True
+    def clear(self):
+        self.move_records = []
+        self.moves = []
+        self.spawn_records = []
+        self.spawns = []
 
-    def get_scale(self):
-        # Start small and grow to full size
-        return min(1.0, self.progress * 1.2)
+    def update(self, dt):
+        """Advance by dt seconds, dropping finished animations"""
+        self.time += dt
+        now = self.time
 
-class Particle:
-    def __init__(self, x, y, color, value):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.value = value
-        self.size = random.randint(4, 8)
-        self.vx = random.uniform(-3, 3)
-        self.vy = random.uniform(-3, 3)
-        self.life = 1.0  # Life from 1 to 0
-        self.fade_speed = random.uniform(0.02, 0.05)
-        
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.1  # Gravity
-        self.size -= 0.1
-        self.life -= self.fade_speed
-        return self.life > 0 and self.size > 0
-        
-    def draw(self, surface):
-        # Apply fade to color
-        alpha = int(255 * self.life)
-        color = (self.color[0], self.color[1], self.color[2], alpha)
-        
-        # Draw particle
-        if self.size > 0:
-            pygame.draw.circle(
-                surface,
-                color,
-                (int(self.x), int(self.y)),
-                int(self.size)
-            ) 
\ No newline at end of file
+        records = []
+        moves = []
+        for record in self.move_records:
+            start, from_pos, to_pos, value, merged = record
+            progress = (now - start) / self.move_duration
+            if progress >= 1.0:
+                continue
+            records.append(record)
+            # Smooth easing function (easeOutQuad), and a slight bounce to
+            # merged tiles at the end of the move
+            t = 1.0 - (1.0 - progress) * (1.0 - progress)
+            scale = 1.1 - (progress - 0.8) * 0.5 if merged and progress > 0.8 else 1.0
+            moves.append((from_pos, to_pos, value, merged, t, scale))
+        self.move_records = records
+        self.moves = moves
+
+        records = []
+        spawns = []
+        for record in self.spawn_records:
+            start, pos, value = record
+            progress = (now - start) / self.spawn_duration
+            if progress >= 1.0:
+                continue
+            records.append(record)
+            # Start small and grow to full size
+            spawns.append((pos, value, min(1.0, max(0.0, progress * 1.2))))
+        self.spawn_records = records
+        self.spawns = spawns
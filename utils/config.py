@@ -1,12 +1,26 @@
-import pygame
-
 # Constants
 WIDTH, HEIGHT = 500, 600  # Slightly taller for score display
 GRID_SIZE = 4
 TILE_SIZE = WIDTH // GRID_SIZE  # Automatically calculate tile size based on window width
 GRID_PADDING = 5  # Reduced padding to ensure tiles fill more space
 FPS = 60
+MOVE_ANIMATION_MS = 170  # Tile slide duration, independent of frame rate
+SPAWN_ANIMATION_MS = 120  # New tile grow-in duration
+INPUT_QUEUE_SIZE = 16  # Move keys buffered between frames
+INPUT_COALESCE = True  # Apply every queued move each frame, animating only the last; False plays one per frame
+IDLE_TIMEOUT_MS = 1000  # Longest sleep while nothing on screen is moving
+GAME_OVER_FPS = 20  # Frame rate of the game over pulse; 0 lets it sleep like any idle screen
 WINDOW_TITLE = "2048 Game"
+UNDO_MEMORY_LIMIT = 512 * 1024  # Bytes kept for undo/redo history
+NTUPLE_WEIGHTS = "ntuple.weights"  # Trained n-tuple network used by the ntuple autoplayer
+TILE_SPRITE_CACHE_SIZE = 256  # Composited tile sprites kept by the renderer
+TEXT_CACHE_SIZE = 128  # Rendered strings kept by the renderer
+PARTICLE_BUDGET = 600  # Most merge particles alive at once
+PARTICLE_SPRITE_CACHE_SIZE = 1024  # Circle sprites by (radius, color, alpha level)
+THEME_WARMUP = True  # Build every theme's background and colors on a background thread after the first frame
+HIGH_SCORE_FILE = "high_score.txt"
+HIGH_SCORE_FLUSH_INTERVAL = 5.0  # Seconds between background writes of a new high score
+FONT_CACHE = "font_cache.json"  # Resolved system font paths, so later starts skip the font scan
 
 # Theme definitions
 THEMES = {
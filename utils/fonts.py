@@ -0,0 +1,50 @@
+import os
+import json
+import pygame
+from utils.config import FONT_CACHE
+
+# Resolved (path, synthetic bold) by "name:style", loaded from FONT_CACHE
+_resolved = None
+
+
+def read_font_cache(path=FONT_CACHE):
+    try:
+        with open(path) as file:
+            entries = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def write_font_cache(entries, path=FONT_CACHE):
+    try:
+        with open(path, "w") as file:
+            json.dump(entries, file, indent=2)
+    except OSError:
+        pass  # A read-only install just resolves again next time
+
+
+def resolve_font(name, bold=False):
+    """(font file, synthetic bold) for a system font name, as SysFont would pick it"""
+    global _resolved
+    if _resolved is None:
+        _resolved = read_font_cache()
+    key = f"{name.lower()}:{'bold' if bold else 'regular'}"
+    entry = _resolved.get(key)
+    if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+        return tuple(entry)
+
+    path = pygame.font.match_font(name, bold=bold)
+    synthetic_bold = bold and (path is None or path == pygame.font.match_font(name))
+    _resolved[key] = [path, synthetic_bold]
+    write_font_cache(_resolved)
+    return path, synthetic_bold
+
+
+def load_font(name, size, bold=False):
+    """Drop-in for pygame.font.SysFont that resolves the file through the cache"""
+    path, synthetic_bold = resolve_font(name, bold)
+    font = pygame.font.Font(path, size)
+    if synthetic_bold:
+        font.set_bold(True)
+    return font
@@ -0,0 +1,97 @@
+import numpy as np
+import pygame
+
+# Columns of the particle state array
+X, Y, VX, VY, SIZE, LIFE, FADE = range(7)
+
+
+class ParticleSystem:
+    """Merge particles stored as a structure of arrays"""
+
+    def __init__(self, capacity=600, seed=None):
+        self.capacity = capacity
+        self.state = np.zeros((capacity, 7), dtype=np.float32)
+        self.color_ids = np.zeros(capacity, dtype=np.int16)
+        self.count = 0
+        self.palette = []  # Colors by id
+        self.color_index = {}
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, x, y, color, count=20):
+        """Add a burst of particles at a point; returns how many fit"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return 0
+        color = tuple(color[:3])
+        if color not in self.color_index:
+            self.color_index[color] = len(self.palette)
+            self.palette.append(color)
+
+        start, end = self.count, self.count + count
+        rng = self.rng
+        burst = self.state[start:end]
+        burst[:, X] = x
+        burst[:, Y] = y
+        burst[:, VX] = rng.uniform(-3, 3, count)
+        burst[:, VY] = rng.uniform(-3, 3, count)
+        burst[:, SIZE] = rng.integers(4, 9, count)
+        burst[:, LIFE] = 1.0
+        burst[:, FADE] = rng.uniform(0.02, 0.05, count)
+        self.color_ids[start:end] = self.color_index[color]
+        self.count = end
+        return count
+
+    def update(self, dt=1 / 60):
+        """Advance every particle by dt seconds and drop the dead ones"""
+        n = self.count
+        if not n:
+            return
+        # Velocities and rates are per 60 Hz frame
+        steps = dt * 60
+        live = self.state[:n]
+        live[:, X] += live[:, VX] * steps
+        live[:, Y] += live[:, VY] * steps
+        live[:, VY] += 0.1 * steps  # Gravity
+        live[:, SIZE] -= 0.1 * steps
+        live[:, LIFE] -= live[:, FADE] * steps
+        alive = (live[:, LIFE] > 0) & (live[:, SIZE] > 0)
+
+        # Swap-remove: fill the dead slots among the first `kept` rows with
+        # the live rows that lie beyond them
+        kept = int(np.count_nonzero(alive))
+        holes = np.flatnonzero(~alive[:kept])
+        movers = np.flatnonzero(alive[kept:]) + kept
+        self.state[holes] = self.state[movers]
+        self.color_ids[holes] = self.color_ids[movers]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def draw_list(self):
+        """Per visible particle (x, y, radius, color id, alpha level) lists,
+        with alpha quantized to 16 levels"""
+        live = self.state[:self.count]
+        radii = live[:, SIZE].astype(np.int32)
+        visible = radii > 0
+        xs = live[visible, X].astype(np.int32)
+        ys = live[visible, Y].astype(np.int32)
+        levels = (np.clip(live[visible, LIFE], 0.0, 1.0) * 255).astype(np.int32) >> 4
+        return xs.tolist(), ys.tolist(), radii[visible].tolist(), self.color_ids[:self.count][visible].tolist(), levels.tolist()
+
+    def bounds(self):
+        """Screen rectangle covering every particle, or None"""
+        if not self.count:
+            return None
+        live = self.state[:self.count]
+        radii = live[:, SIZE].astype(np.int32)
+        xs = live[:, X].astype(np.int32)
+        ys = live[:, Y].astype(np.int32)
+        left = int((xs - radii).min()) - 1
+        top = int((ys - radii).min()) - 1
+        right = int((xs + radii).max()) + 2
+        bottom = int((ys + radii).max()) + 2
+        return pygame.Rect(left, top, right - left, bottom - top)
@@ -0,0 +1,157 @@
+import json
+import time
+from array import array
+
+# Frame stages, timed back to back in this order. The render sub-stages
+# (background to flip) add up to the render time.
+EVENTS = 0
+UPDATE = 1
+BACKGROUND = 2
+TILES = 3
+PARTICLES = 4
+OVERLAY = 5
+FLIP = 6
+TICK = 7
+STAGE_NAMES = ("events", "update", "background", "tiles", "particles", "overlay", "flip", "tick")
+
+# Totals derived from the stages when a frame ends
+RENDER = 8
+WORK = 9   # Everything except waiting in clock.tick
+FRAME = 10
+COLUMN_NAMES = STAGE_NAMES + ("render", "work", "frame")
+
+# Rows of the on-screen overlay, indented under render for its sub-stages
+OVERLAY_ROWS = (
+    ("events", EVENTS), ("update", UPDATE), ("render", RENDER),
+    ("  background", BACKGROUND), ("  tiles", TILES), ("  particles", PARTICLES),
+    ("  overlay", OVERLAY), ("  flip", FLIP), ("work", WORK), ("frame", FRAME),
+)
+
+
+class FrameProfiler:
+    """Per-frame stage timer with rolling percentiles"""
+
+    def __init__(self, budget_ms=1000 / 60, capacity=300, log_path=None):
+        self.budget_ns = int(budget_ms * 1_000_000)
+        self.capacity = capacity
+        self.columns = [array("q", bytes(8 * capacity)) for _ in COLUMN_NAMES]
+        self.count = 0   # Frames held in the ring buffers
+        self.next = 0    # Slot the next frame goes into
+        self.frames = 0  # Frames profiled in total
+        self.current = [0] * len(STAGE_NAMES)
+        self.frame_start = 0
+        self.last = 0
+        self.show = False
+        self.recording = False
+        self.log = None
+        self.log_format = None
+        if log_path:
+            self.open_log(log_path)
+        self.enabled = self.log is not None
+        self._summary = None
+
+    def open_log(self, path):
+        self.log = open(path, "w", newline="")
+        if path.endswith(".jsonl"):
+            self.log_format = "jsonl"
+        else:
+            self.log_format = "csv"
+            self.log.write(",".join(("frame",) + tuple(f"{name}_ns" for name in COLUMN_NAMES)) + "\n")
+
+    def toggle_overlay(self):
+        """Show or hide the overlay; timing runs while either is wanted"""
+        self.show = not self.show
+        self.enabled = self.show or self.log is not None
+
+    def start_frame(self):
+        # Toggles take effect at frame boundaries so a frame is never half-timed
+        self.recording = self.enabled
+        if self.recording:
+            self.frame_start = self.last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        """Charge the time since the previous lap to a stage"""
+        if self.recording:
+            now = time.perf_counter_ns()
+            self.current[stage] += now - self.last
+            self.last = now
+
+    def end_frame(self):
+        if not self.recording:
+            return
+        current = self.current
+        render = sum(current[BACKGROUND:TICK])
+        frame = self.last - self.frame_start
+        row = current + [render, frame - current[TICK], frame]
+
+        slot = self.next
+        for column, value in zip(self.columns, row):
+            column[slot] = value
+        self.next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.frames += 1
+        if self.log is not None:
+            self.write_row(row)
+        self.current = [0] * len(STAGE_NAMES)
+        if self.frames % 30 == 0:
+            self._summary = None
+
+    def write_row(self, row):
+        if self.log_format == "jsonl":
+            record = {"frame": self.frames}
+            record.update((f"{name}_ns", value) for name, value in zip(COLUMN_NAMES, row))
+            self.log.write(json.dumps(record) + "\n")
+        else:
+            self.log.write(f"{self.frames}," + ",".join(map(str, row)) + "\n")
+
+    def percentiles(self, column, points=(50, 95, 99)):
+        """Nearest-rank percentiles in ns of one column over the window"""
+        if not self.count:
+            return tuple(0 for _ in points)
+        ordered = sorted(self.columns[column][:self.count])
+        return tuple(ordered[min(self.count - 1, self.count * point // 100)] for point in points)
+
+    def missed_frames(self):
+        """Frames in the window whose work overran the frame budget"""
+        return sum(1 for work in self.columns[WORK][:self.count] if work > self.budget_ns)
+
+    def summary(self):
+        """Overlay text lines, refreshed every 30 frames"""
+        if self._summary is None:
+            lines = [f"{'stage':12}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+            for label, column in OVERLAY_ROWS:
+                p50, p95, p99 = self.percentiles(column)
+                lines.append(f"{label:12}{p50 / 1e6:7.2f}{p95 / 1e6:7.2f}{p99 / 1e6:7.2f}")
+            lines.append(f"over {self.budget_ns / 1e6:.1f} ms: {self.missed_frames()}/{self.count} frames")
+            self._summary = lines
+        return self._summary
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+
+class StartupTimer:
+    """Wall-clock marks from launch to the first frame.
+
+    Each mark records how long the step since the previous one took, and
+    report lists them with the running total.
+    """
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter_ns()
+        self.marks = []
+
+    def mark(self, label):
+        now = time.perf_counter_ns()
+        self.marks.append((label, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = [f"{'startup':20}{'step':>9}{'total':>10}"]
+        total = 0
+        for label, elapsed in self.marks:
+            total += elapsed
+            lines.append(f"{label:20}{elapsed / 1e6:6.1f} ms{total / 1e6:7.1f} ms")
+        return "\n".join(lines)
@@ -1,24 +1,67 @@
+import threading
+import numpy as np
 import pygame
 from utils.config import THEMES, DEFAULT_TILE_COLORS, WIDTH, HEIGHT
 
+def build_gradient(top, bottom, width, height):
+    """Vertical gradient surface from top to bottom color.
+
+    One column is computed with NumPy and stretched to the full width, which
+    gives the same pixels as drawing every row as a line.
+    """
+    # Interpolation factor per row (0 at top, 1 at bottom)
+    t = np.arange(height, dtype=np.float64)[:, None] / height
+    column = (np.array(top, dtype=np.float64) * (1 - t) + np.array(bottom, dtype=np.float64) * t).astype(np.uint8)
+    strip = pygame.surfarray.make_surface(column[None, :, :])
+    return pygame.transform.scale(strip, (width, height))
+
 class ThemeManager:
-    def __init__(self, default_theme='classic'):
+    """Current theme colors and the assets built from them.
+
+    Each theme's gradient background and tile color table are built once per
+    window size and kept, so switching to a theme that has been seen before,
+    or restarting on the same one, only swaps references. warm_up builds the
+    assets of every theme on a background thread.
+    """
+
+    def __init__(self, default_theme='classic', warm_up=False):
         self.current_theme = default_theme
-        self.background_color = THEMES[self.current_theme]['background_color']
-        self.gradient_top = THEMES[self.current_theme]['gradient_top']
-        self.gradient_bottom = THEMES[self.current_theme]['gradient_bottom']
-        self.grid_color = THEMES[self.current_theme]['grid_color']
-        self.text_color = THEMES[self.current_theme]['text_color']
-        self.light_text_color = THEMES[self.current_theme]['light_text_color']
-        
-        # Initialize tile colors with the default ones
-        self.tile_colors = DEFAULT_TILE_COLORS.copy()
-        self.tile_colors[0] = THEMES[self.current_theme]['empty_tile']
-        
-        # Initialize the gradient background
+        self.assets = {}  # (theme, (width, height)) -> (gradient background, tile colors)
+        self.assets_lock = threading.Lock()
+        self.current_assets = None
+
+        # Callbacks run after the theme colors change, e.g. to drop cached sprites
+        self.on_change = []
+
         self.gradient_background = None
-        self.create_gradient_background(WIDTH, HEIGHT)
-    
+        self.tile_colors = None
+        self.update_theme_colors()
+        if warm_up:
+            self.warm_up()
+
+    def theme_assets(self, theme_name, size=(WIDTH, HEIGHT)):
+        """Gradient background and tile color table of a theme, built on first use"""
+        key = (theme_name, size)
+        with self.assets_lock:
+            assets = self.assets.get(key)
+            if assets is None:
+                theme = THEMES[theme_name]
+                tile_colors = DEFAULT_TILE_COLORS.copy()
+                tile_colors[0] = theme['empty_tile']
+                gradient = build_gradient(theme['gradient_top'], theme['gradient_bottom'], *size)
+                assets = self.assets[key] = (gradient, tile_colors)
+        return assets
+
+    def warm_up(self, size=(WIDTH, HEIGHT)):
+        """Build every theme's assets on a daemon thread; returns the thread"""
+        def build_all():
+            for theme_name in THEMES:
+                self.theme_assets(theme_name, size)
+
+        thread = threading.Thread(target=build_all, name="theme-warm-up", daemon=True)
+        thread.start()
+        return thread
+
     def set_theme(self, theme_name):
         """Change the current theme"""
         if theme_name in THEMES:
@@ -26,33 +69,27 @@ class ThemeManager:
             self.update_theme_colors()
             return True
         return False
-    
+
     def update_theme_colors(self):
-        """Update colors based on current theme"""
-        self.background_color = THEMES[self.current_theme]['background_color']
-        self.gradient_top = THEMES[self.current_theme]['gradient_top']
-        self.gradient_bottom = THEMES[self.current_theme]['gradient_bottom']
-        self.grid_color = THEMES[self.current_theme]['grid_color']
-        self.text_color = THEMES[self.current_theme]['text_color']
-        self.light_text_color = THEMES[self.current_theme]['light_text_color']
-        
-        # Update empty tile color
-        self.tile_colors[0] = THEMES[self.current_theme]['empty_tile']
-        
-        # Update background
-        self.create_gradient_background(WIDTH, HEIGHT)
-    
+        """Update colors based on current theme; nothing happens if they are current"""
+        assets = self.theme_assets(self.current_theme)
+        if assets is self.current_assets:
+            return
+        self.current_assets = assets
+        self.gradient_background, self.tile_colors = assets
+
+        theme = THEMES[self.current_theme]
+        self.background_color = theme['background_color']
+        self.gradient_top = theme['gradient_top']
+        self.gradient_bottom = theme['gradient_bottom']
+        self.grid_color = theme['grid_color']
+        self.text_color = theme['text_color']
+        self.light_text_color = theme['light_text_color']
+
+        for callback in self.on_change:
+            callback()
+
     def create_gradient_background(self, width=500, height=600):
         """Create a gradient background for the current theme"""
-        self.gradient_background = pygame.Surface((width, height))
-        for y in range(height):
-            # Calculate the interpolation factor (0 at top, 1 at bottom)
-            t = y / height
-            # Interpolate between the top and bottom colors
-            r = int(self.gradient_top[0] * (1 - t) + self.gradient_bottom[0] * t)
-            g = int(self.gradient_top[1] * (1 - t) + self.gradient_bottom[1] * t)
-            b = int(self.gradient_top[2] * (1 - t) + self.gradient_bottom[2] * t)
-            # Draw a horizontal line with the interpolated color
-            pygame.draw.line(self.gradient_background, (r, g, b), (0, y), (width, y))
-        
-        return self.gradient_background 
\ No newline at end of file
+        self.gradient_background = build_gradient(self.gradient_top, self.gradient_bottom, width, height)
+        return self.gradient_background
@@ -1,203 +1,465 @@
 import pygame
 import math
-from utils.config import WIDTH, HEIGHT, GRID_SIZE, TILE_SIZE, GRID_PADDING, OVERLAY_COLOR
+import time
+from utils.config import (
+    WIDTH, HEIGHT, GRID_SIZE, TILE_SIZE, GRID_PADDING, OVERLAY_COLOR, TILE_SPRITE_CACHE_SIZE, TEXT_CACHE_SIZE,
+    PARTICLE_SPRITE_CACHE_SIZE,
+)
+from utils.fonts import load_font
+from utils.profiler import FrameProfiler, BACKGROUND, TILES, PARTICLES
+from views.sprite_cache import SpriteCache
+
+SHADOW_OFFSET = 3
+MAX_GLOW = 4  # Widest glow around the game over title, in pixels
+
+# Score box layout
+SCORE_BOX_WIDTH = 90
+SCORE_BOX_HEIGHT = 65
+SCORE_BOX_X = WIDTH - 190
+BEST_BOX_X = WIDTH - 95
+
+
+def merge_rects(rects, bounds):
+    """Clip rectangles to bounds and merge overlapping ones"""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.width or not rect.height:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
 
 class GameRenderer:
-    def __init__(self, screen, theme_manager):
+    def __init__(self, screen, theme_manager, profiler=None, dirty_rects=False):
         self.screen = screen
         self.theme_manager = theme_manager
-        
-        # Initialize font objects directly
-        self.font = pygame.font.SysFont("Arial", 40, bold=True)
-        self.small_font = pygame.font.SysFont("Arial", 24, bold=True)
-        self.title_font = pygame.font.SysFont("Arial", 50, bold=True)
+        # Stage timing; a profiler that is never enabled costs next to nothing
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        
+        # Font files are looked up once and cached on disk, see utils.fonts
+        self.font = load_font("Arial", 40, bold=True)
+        self.small_font = load_font("Arial", 24, bold=True)
+        self.title_font = load_font("Arial", 50, bold=True)
+        self.profile_font = None  # Created the first time the profiler overlay is shown
+        
+        # Composited tile sprites, rebuilt whenever the theme colors change
+        self.tile_sprites = SpriteCache(TILE_SPRITE_CACHE_SIZE)
+        theme_manager.on_change.append(self.tile_sprites.clear)
+        
+        # Rendered text by (font, string, color), and the game over screen's
+        # glow sprites and overlay, built the first time they are needed
+        self.text_cache = SpriteCache(TEXT_CACHE_SIZE)
+        self.particle_sprites = SpriteCache(PARTICLE_SPRITE_CACHE_SIZE)
+        self.glow_sprites = None
+        self.game_over_overlay = None
+        
+        # Background, header, score boxes and empty slots, composited once
+        # per theme and grid size
+        self.static_layer = None
+        self.static_layer_key = None
+        theme_manager.on_change.append(self.invalidate_static_layer)
+        
+        # Dirty-rect mode repaints and presents only what changed since the
+        # previous frame, restoring the regions from the static layer
+        self.dirty_rects = dirty_rects
+        self.redraw_all = True
+        self.previous_items = []
+        self.previous_particle_bounds = None
+        self.overlay_rects = []  # Drawn over the scene last frame
+        self.updated_rects = None  # Regions to present, or None for the whole window
+        
+        # Tile metrics follow the size of the grid being drawn
+        self.set_grid_size(GRID_SIZE)
+    
+    def set_grid_size(self, grid_size):
+        """Recompute tile metrics and the tile font for a grid size"""
+        self.grid_size = grid_size
+        self.tile_size = WIDTH // grid_size
+        self.padding = max(1, GRID_PADDING * self.tile_size // TILE_SIZE)
+        if grid_size == GRID_SIZE:
+            self.tile_font = self.font
+        else:
+            font_size = max(8, 40 * self.tile_size // TILE_SIZE)
+            self.tile_font = load_font("Arial", font_size, bold=True)
+        self.tile_sprites.clear()
+        self.redraw_all = True
     
     def draw_tile(self, x, y, size, color, value=None, alpha=255, scale=1.0):
         """Draw a tile with shadow and text."""
+        self.screen.blit(self.tile_sprite(size, color, value, alpha), (x, y))
+    
+    def tile_sprite(self, size, color, value=None, alpha=255):
+        """Return the cached sprite of a tile, rendering it on a miss"""
+        # Sizes are bucketed to whole pixels and alpha to 16 levels, so the
+        # scaled and faded frames of an animation share a handful of sprites
+        size = int(size)
+        alpha_level = alpha >> 4
+        key = (value, size, self.theme_manager.current_theme, alpha_level, color)
+        sprite = self.tile_sprites.get(key)
+        if sprite is None:
+            sprite = self.tile_sprites.put(key, self.render_tile(size, color, value, alpha_level * 17))
+        return sprite
+    
+    def render_text(self, font, text, color):
+        """Return a rendered string from the text cache"""
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.text_cache.put(key, font.render(text, True, color))
+        return surface
+    
+    def render_tile(self, size, color, value, alpha):
+        """Composite a tile's shadow, face and text into one surface"""
+        sprite = pygame.Surface((size + SHADOW_OFFSET, size + SHADOW_OFFSET), pygame.SRCALPHA)
+        
         # Draw shadow
-        shadow_offset = 3
         shadow_color = (0, 0, 0, 100)  # Semi-transparent black
-        shadow = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.rect(shadow, shadow_color, (0, 0, size, size), border_radius=5)
-        self.screen.blit(shadow, (x + shadow_offset, y + shadow_offset))
+        pygame.draw.rect(sprite, shadow_color, (SHADOW_OFFSET, SHADOW_OFFSET, size, size), border_radius=5)
         
         # Draw tile
         tile = pygame.Surface((size, size), pygame.SRCALPHA)
         color_with_alpha = (*color, alpha)
         pygame.draw.rect(tile, color_with_alpha, (0, 0, size, size), border_radius=5)
-        self.screen.blit(tile, (x, y))
+        sprite.blit(tile, (0, 0))
         
         # Draw text if value is provided
         if value and value != 0:
             text_color = self.theme_manager.light_text_color if value > 4 else self.theme_manager.text_color
-            text = self.font.render(str(value), True, text_color)
+            text = self.tile_font.render(str(value), True, text_color)
             text_size = text.get_size()
-            self.screen.blit(text, (x + (size - text_size[0]) / 2, y + (size - text_size[1]) / 2))
+            sprite.blit(text, ((size - text_size[0]) // 2, (size - text_size[1]) // 2))
+        return sprite
     
     def draw_grid(self, game_grid, score_manager):
         """Draws the grid, tiles, score, and animations."""
+        if game_grid.size != self.grid_size:
+            self.set_grid_size(game_grid.size)
+        items = self.scene_items(game_grid, score_manager)
+        particle_bounds = game_grid.particles.bounds() if game_grid.particles else None
+        
+        if self.dirty_rects and not self.redraw_all:
+            self.redraw_dirty(items, particle_bounds)
+        else:
+            self.draw_background()
+            self.redraw_all = False
+            self.updated_rects = None
+            self.overlay_rects = []
+            self.profiler.lap(BACKGROUND)
+            for key, rect, draw, args in items:
+                draw(*args)
+            self.profiler.lap(TILES)
+        
+        # Draw particles
+        if game_grid.particles:
+            self.draw_particles(game_grid.particles)
+        self.profiler.lap(PARTICLES)
+        
+        self.previous_items = items
+        self.previous_particle_bounds = particle_bounds
+    
+    def draw_background(self):
+        """Draw everything that does not change between moves"""
+        key = (self.theme_manager.current_theme, self.screen.get_size(), self.grid_size)
+        if self.static_layer is None or self.static_layer_key != key:
+            self.static_layer = self.build_static_layer()
+            self.static_layer_key = key
+        self.screen.blit(self.static_layer, (0, 0))
+    
+    def build_static_layer(self):
+        """Composite the background, header, score boxes and empty grid into
+        one surface"""
+        layer = pygame.Surface(self.screen.get_size())
+        
         # Draw the gradient background
-        self.screen.blit(self.theme_manager.gradient_background, (0, 0))
+        layer.blit(self.theme_manager.gradient_background, (0, 0))
         
         # Draw title and score area
         title_text = self.title_font.render("2048", True, self.theme_manager.text_color)
-        self.screen.blit(title_text, (20, 20))
+        layer.blit(title_text, (20, 20))
         
         # Draw theme name
         theme_text = self.small_font.render(f"Theme: {self.theme_manager.current_theme}", True, self.theme_manager.text_color)
-        self.screen.blit(theme_text, (20, 60))
+        layer.blit(theme_text, (20, 60))
         
         # Draw score boxes with subtle shadows
-        # Increase box width and adjust position
-        box_width = 90  # Increased from 75
-        box_height = 65  # Increased from 60
-        score_box_x = WIDTH - 190  # Adjusted for wider boxes
-        best_box_x = WIDTH - 95
-        
         # Shadow for first box
-        pygame.draw.rect(self.screen, (0, 0, 0, 100), (score_box_x + 3, 23, box_width, box_height), border_radius=6)
+        pygame.draw.rect(layer, (0, 0, 0, 100), (SCORE_BOX_X + 3, 23, SCORE_BOX_WIDTH, SCORE_BOX_HEIGHT), border_radius=6)
         # Shadow for second box
-        pygame.draw.rect(self.screen, (0, 0, 0, 100), (best_box_x + 3, 23, box_width, box_height), border_radius=6)
+        pygame.draw.rect(layer, (0, 0, 0, 100), (BEST_BOX_X + 3, 23, SCORE_BOX_WIDTH, SCORE_BOX_HEIGHT), border_radius=6)
         
         # Actual score boxes
-        pygame.draw.rect(self.screen, self.theme_manager.grid_color, (score_box_x, 20, box_width, box_height), border_radius=6)
-        pygame.draw.rect(self.screen, self.theme_manager.grid_color, (best_box_x, 20, box_width, box_height), border_radius=6)
+        pygame.draw.rect(layer, self.theme_manager.grid_color, (SCORE_BOX_X, 20, SCORE_BOX_WIDTH, SCORE_BOX_HEIGHT), border_radius=6)
+        pygame.draw.rect(layer, self.theme_manager.grid_color, (BEST_BOX_X, 20, SCORE_BOX_WIDTH, SCORE_BOX_HEIGHT), border_radius=6)
         
         score_label = self.small_font.render("SCORE", True, self.theme_manager.text_color)
         best_label = self.small_font.render("BEST", True, self.theme_manager.text_color)
-        
-        score_value = self.small_font.render(str(score_manager.current_score), True, self.theme_manager.text_color)
-        best_value = self.small_font.render(str(score_manager.best_score), True, self.theme_manager.text_color)
-        
-        # Center text in the boxes
-        self.screen.blit(score_label, (score_box_x + (box_width - score_label.get_width()) // 2, 25))
-        self.screen.blit(best_label, (best_box_x + (box_width - best_label.get_width()) // 2, 25))
-        self.screen.blit(score_value, (score_box_x + (box_width - score_value.get_width()) // 2, 50))
-        self.screen.blit(best_value, (best_box_x + (box_width - best_value.get_width()) // 2, 50))
+        layer.blit(score_label, (SCORE_BOX_X + (SCORE_BOX_WIDTH - score_label.get_width()) // 2, 25))
+        layer.blit(best_label, (BEST_BOX_X + (SCORE_BOX_WIDTH - best_label.get_width()) // 2, 25))
         
         # Draw grid background with shadow
         shadow_offset = 5
         pygame.draw.rect(
-            self.screen,
+            layer,
             (0, 0, 0, 100),
             (shadow_offset, 100 + shadow_offset, WIDTH, HEIGHT - 100),
             border_radius=10
         )
         pygame.draw.rect(
-            self.screen,
+            layer,
             self.theme_manager.grid_color,
             (0, 100, WIDTH, HEIGHT - 100),
             border_radius=10
         )
         
         # Draw empty tile slots
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                self.draw_tile(
-                    j * TILE_SIZE + GRID_PADDING,
-                    i * TILE_SIZE + 100,
-                    TILE_SIZE - 2*GRID_PADDING,
-                    self.theme_manager.tile_colors[0]
-                )
+        tile_size = self.tile_size
+        padding = self.padding
+        empty_slot = self.tile_sprite(tile_size - 2*padding, self.theme_manager.tile_colors[0])
+        for i in range(self.grid_size):
+            for j in range(self.grid_size):
+                layer.blit(empty_slot, (j * tile_size + padding, i * tile_size + 100))
+        
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        return layer
+    
+    def invalidate_static_layer(self):
+        """Drop the static layer so it is rebuilt with the current theme"""
+        self.static_layer = None
+        self.redraw_all = True
+    
+    def scene_items(self, game_grid, score_manager):
+        """List what goes on top of the background this frame.
+        
+        Each item is (key, rect, draw, args): key identifies what the item
+        looks like, rect is the screen area it covers and draw(*args) paints it.
+        """
+        items = []
+        
+        # Score values, centered in their boxes
+        for box_x, value in ((SCORE_BOX_X, score_manager.current_score), (BEST_BOX_X, score_manager.best_score)):
+            text = self.render_text(self.small_font, str(value), self.theme_manager.text_color)
+            pos = (box_x + (SCORE_BOX_WIDTH - text.get_width()) // 2, 50)
+            items.append((("text", str(value), self.theme_manager.text_color, pos),
+                          text.get_rect(topleft=pos), self.screen.blit, (text, pos)))
+        
+        tile_size = self.tile_size
+        padding = self.padding
+        face_size = tile_size - 2*padding
+        
+        def add_tile(x, y, size, color, value=None, alpha=255):
+            rect = pygame.Rect(int(x) - 1, int(y) - 1, int(size) + SHADOW_OFFSET + 2, int(size) + SHADOW_OFFSET + 2)
+            args = (x, y, size, color, value, alpha)
+            items.append((("tile",) + args, rect, self.draw_tile, args))
         
         # Draw animated tiles (moving)
-        for anim in game_grid.tile_animations:
-            x, y = anim.get_current_position()
-            tile_size = (TILE_SIZE - 2*GRID_PADDING) * (anim.scale if anim.merged else 1.0)
-            self.draw_tile(
+        for from_pos, to_pos, value, merged, t, scale in game_grid.tile_animations:
+            start_x = from_pos[1] * tile_size + padding
+            start_y = from_pos[0] * tile_size + 100
+            x = start_x + (to_pos[1] * tile_size + padding - start_x) * t
+            y = start_y + (to_pos[0] * tile_size + 100 - start_y) * t
+            add_tile(
                 x, y,
-                tile_size,
-                self.theme_manager.tile_colors[anim.value],
-                anim.value
+                face_size * scale,
+                self.theme_manager.tile_colors.get(value, (60, 58, 50)),
+                value
             )
         
         # Draw static tiles (only those not currently animating)
-        animating_positions = [(anim.to_pos[0], anim.to_pos[1]) for anim in game_grid.tile_animations]
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                if (i, j) not in animating_positions and game_grid.grid[i][j] != 0:
-                    # Check if this tile is in new tile animations
-                    in_new_anim = False
-                    for anim in game_grid.new_tile_animations:
-                        if anim.pos == (i, j):
-                            in_new_anim = True
-                            scale = anim.get_scale()
-                            tile_size = (TILE_SIZE - 2*GRID_PADDING) * scale
-                            offset = (TILE_SIZE - 2*GRID_PADDING - tile_size) / 2
-                            
-                            self.draw_tile(
-                                j * TILE_SIZE + GRID_PADDING + offset,
-                                i * TILE_SIZE + 100 + offset,
-                                tile_size,
-                                self.theme_manager.tile_colors[game_grid.grid[i][j]],
-                                game_grid.grid[i][j] if scale > 0.5 else None,  # Only draw text when tile is big enough
-                                int(255 * min(1.0, scale * 1.5))  # Fade in
-                            )
-                            break
+        animating_positions = {anim[1] for anim in game_grid.tile_animations}
+        new_tile_scales = {pos: scale for pos, value, scale in game_grid.new_tile_animations}
+        grid = game_grid.grid
+        for i in range(self.grid_size):
+            row = grid[i]
+            for j in range(self.grid_size):
+                value = row[j]
+                if value == 0 or (i, j) in animating_positions:
+                    continue
+                color = self.theme_manager.tile_colors.get(value, (60, 58, 50))
+                scale = new_tile_scales.get((i, j))
+                if scale == 0:
+                    continue  # Spawned, but waiting for the slide to finish
+                if scale is not None:
+                    new_size = face_size * scale
+                    offset = (face_size - new_size) / 2
                     
-                    if not in_new_anim:
-                        self.draw_tile(
-                            j * TILE_SIZE + GRID_PADDING,
-                            i * TILE_SIZE + 100,
-                            TILE_SIZE - 2*GRID_PADDING,
-                            self.theme_manager.tile_colors[game_grid.grid[i][j]],
-                            game_grid.grid[i][j]
-                        )
-        
-        # Draw particles
-        self.draw_particles(game_grid.particles)
+                    add_tile(
+                        j * tile_size + padding + offset,
+                        i * tile_size + 100 + offset,
+                        new_size,
+                        color,
+                        value if scale > 0.5 else None,  # Only draw text when tile is big enough
+                        int(255 * min(1.0, scale * 1.5))  # Fade in
+                    )
+                else:
+                    add_tile(
+                        j * tile_size + padding,
+                        i * tile_size + 100,
+                        face_size,
+                        color,
+                        value
+                    )
+        return items
+    
+    def redraw_dirty(self, items, particle_bounds):
+        """Repaint only the regions that differ from the previous frame"""
+        previous = {item[0]: item[1] for item in self.previous_items}
+        current = {item[0]: item[1] for item in items}
+        dirty = [rect for key, rect in previous.items() if key not in current]
+        dirty += [rect for key, rect in current.items() if key not in previous]
+        dirty += self.overlay_rects
+        if self.previous_particle_bounds:
+            dirty.append(self.previous_particle_bounds)
+        if particle_bounds:
+            dirty.append(particle_bounds)
+        self.overlay_rects = []
+        self.updated_rects = merge_rects(dirty, self.screen.get_rect())
+        self.profiler.lap(BACKGROUND)
+        
+        # Restore the static scene under each region, then repaint the items
+        # overlapping it, clipped so untouched pixels are never drawn twice
+        for rect in self.updated_rects:
+            self.screen.set_clip(rect)
+            self.screen.blit(self.static_layer, rect, rect)
+            for key, item_rect, draw, args in items:
+                if item_rect.colliderect(rect):
+                    draw(*args)
+        self.screen.set_clip(None)
+        self.profiler.lap(TILES)
+    
+    def invalidate(self):
+        """Repaint and present the whole window on the next frame"""
+        self.redraw_all = True
+    
+    def add_overlay_rect(self, rect):
+        """Note a region drawn over the scene; it is repaired next frame"""
+        if self.updated_rects is not None:
+            self.updated_rects.append(rect)
+        self.overlay_rects.append(rect)
+    
+    def present(self):
+        """Show the frame: just the changed regions in dirty-rect mode,
+        otherwise the whole window"""
+        if self.updated_rects is None:
+            pygame.display.flip()
+        elif self.updated_rects:
+            pygame.display.update(self.updated_rects)
+    
+    def draw_scrub_bar(self, position, total):
+        """Draw a replay progress bar under the title and return its rectangle"""
+        bar = pygame.Rect(20, 90, WIDTH - 40, 6)
+        pygame.draw.rect(self.screen, self.theme_manager.grid_color, bar, border_radius=3)
+        filled = bar.width * position // total if total else bar.width
+        pygame.draw.rect(self.screen, self.theme_manager.text_color, (bar.x, bar.y, filled, bar.height), border_radius=3)
+        pygame.draw.circle(self.screen, self.theme_manager.text_color, (bar.x + filled, bar.centery), 6)
+        self.add_overlay_rect(bar.inflate(12, 12))
+        return bar
+    
+    def draw_profile_overlay(self, profiler):
+        """Draw the frame timing percentiles in a panel at the top left"""
+        if self.profile_font is None:
+            self.profile_font = load_font("Courier New", 13, bold=True)
+        lines = profiler.summary()
+        line_height = self.profile_font.get_linesize()
+        panel = pygame.Surface((270, line_height * len(lines) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, line in enumerate(lines):
+            text = self.profile_font.render(line, True, (255, 255, 255))
+            panel.blit(text, (5, 5 + i * line_height))
+        self.screen.blit(panel, (0, 0))
+        self.add_overlay_rect(panel.get_rect())
     
     def draw_particles(self, particles):
-        """Draw all particles"""
-        particle_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        for particle in particles:
-            particle.draw(particle_surface)
-        self.screen.blit(particle_surface, (0, 0))
+        """Draw all particles as cached circle sprites in one blits call"""
+        sprites = self.particle_sprites
+        palette = particles.palette
+        blits = []
+        for x, y, radius, color_id, level in zip(*particles.draw_list()):
+            key = (radius, color_id, level)
+            sprite = sprites.get(key)
+            if sprite is None:
+                sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (*palette[color_id], level * 17), (radius, radius), radius)
+                sprite = sprites.put(key, sprite)
+            blits.append((sprite, (x - radius, y - radius)))
+        self.screen.blits(blits, doreturn=False)
+    
+    def glow_sprite(self, glow_size):
+        """Return the golden glow drawn behind the game over title.
+        
+        The glow is a stack of offset copies of the title, so each of its
+        sizes is composited once into a sprite with a MAX_GLOW margin.
+        """
+        if self.glow_sprites is None:
+            self.glow_sprites = {}
+            for size in range(1, MAX_GLOW + 1):
+                width, height = self.title_font.size("Game Over!")
+                sprite = pygame.Surface((width + 2 * MAX_GLOW, height + 2 * MAX_GLOW), pygame.SRCALPHA)
+                for offset in range(size, 0, -1):
+                    glow_color = (255, 215, 0, int(150/offset))  # Golden glow
+                    glow_text = self.title_font.render("Game Over!", True, glow_color)
+                    for dx, dy in ((-offset, -offset), (offset, -offset), (-offset, offset), (offset, offset)):
+                        sprite.blit(glow_text, (MAX_GLOW + dx, MAX_GLOW + dy))
+                if pygame.display.get_surface() is not None:
+                    sprite = sprite.convert_alpha()
+                self.glow_sprites[size] = sprite
+        return self.glow_sprites[min(glow_size, MAX_GLOW)]
     
     def draw_game_over(self, score_manager):
         """Draw game over overlay and return button rectangles"""
-        # Create a semi-transparent overlay
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill(OVERLAY_COLOR)
+        # The overlay covers the whole window, so present all of it and
+        # repaint everything once it is gone
+        self.updated_rects = None
+        self.redraw_all = True
+        
+        # Semi-transparent overlay, created once and reused. It is a plain
+        # surface with the overlay's own alpha folded into its surface alpha,
+        # which blits much faster than per-pixel alpha
+        if self.game_over_overlay is None:
+            self.game_over_overlay = pygame.Surface((WIDTH, HEIGHT))
+            if pygame.display.get_surface() is not None:
+                self.game_over_overlay = self.game_over_overlay.convert()
+            self.game_over_overlay.fill(OVERLAY_COLOR[:3])
+        overlay = self.game_over_overlay
         
         # Apply a pulsating alpha for a cool effect
-        current_time = pygame.time.get_ticks()
+        current_time = time.perf_counter() * 1000
         pulse = (math.sin(current_time * 0.003) * 0.1) + 0.9  # Pulsate between 0.8 and 1.0
         
         # Apply the alpha
-        overlay.set_alpha(int(200 * pulse))
+        overlay.set_alpha(int(200 * pulse) * OVERLAY_COLOR[3] // 255)
         self.screen.blit(overlay, (0, 0))
         
         # Game over text with subtle glow effect
         glow_size = int(2 + math.sin(current_time * 0.005) * 2)
-        
-        # Glow effect
-        for offset in range(glow_size, 0, -1):
-            glow_color = (255, 215, 0, int(150/offset))  # Golden glow
-            glow_text = self.title_font.render("Game Over!", True, glow_color)
-            self.screen.blit(glow_text, (WIDTH//2 - glow_text.get_width()//2 - offset, HEIGHT//2 - 120 - offset))
-            self.screen.blit(glow_text, (WIDTH//2 - glow_text.get_width()//2 + offset, HEIGHT//2 - 120 - offset))
-            self.screen.blit(glow_text, (WIDTH//2 - glow_text.get_width()//2 - offset, HEIGHT//2 - 120 + offset))
-            self.screen.blit(glow_text, (WIDTH//2 - glow_text.get_width()//2 + offset, HEIGHT//2 - 120 + offset))
+        game_over_text = self.render_text(self.title_font, "Game Over!", (255, 255, 255))
+        text_x = WIDTH//2 - game_over_text.get_width()//2
+        if glow_size > 0:
+            self.screen.blit(self.glow_sprite(glow_size), (text_x - MAX_GLOW, HEIGHT//2 - 120 - MAX_GLOW))
         
         # Main text
-        game_over_text = self.title_font.render("Game Over!", True, (255, 255, 255))
-        self.screen.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, HEIGHT//2 - 120))
+        self.screen.blit(game_over_text, (text_x, HEIGHT//2 - 120))
         
         # Display current score
-        score_text = self.font.render(f"Your Score: {score_manager.current_score}", True, (255, 255, 255))
+        score_text = self.render_text(self.font, f"Your Score: {score_manager.current_score}", (255, 255, 255))
         self.screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//2 - 60))
         
         # Display highest score with a nice decoration
         if score_manager.current_score >= score_manager.best_score and score_manager.current_score > 0:
-            high_score_text = self.font.render(f"NEW HIGH SCORE!", True, (255, 215, 0))  # Gold color
+            high_score_text = self.render_text(self.font, "NEW HIGH SCORE!", (255, 215, 0))  # Gold color
             self.screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, HEIGHT//2 - 20))
         else:
-            high_score_text = self.font.render(f"Best Score: {score_manager.best_score}", True, (255, 255, 255))
+            high_score_text = self.render_text(self.font, f"Best Score: {score_manager.best_score}", (255, 255, 255))
             self.screen.blit(high_score_text, (WIDTH//2 - high_score_text.get_width()//2, HEIGHT//2 - 20))
         
         # Display theme info
-        theme_text = self.small_font.render(f"Press 1-5 to change theme (current: {self.theme_manager.current_theme})", True, (200, 200, 200))
+        theme_text = self.render_text(
+            self.small_font, f"Press 1-5 to change theme (current: {self.theme_manager.current_theme})", (200, 200, 200)
+        )
         self.screen.blit(theme_text, (WIDTH//2 - theme_text.get_width()//2, HEIGHT//2 + 150))
         
         # Get mouse position for hover effects
@@ -216,7 +478,7 @@ class GameRenderer:
         else:
             pygame.draw.rect(self.screen, button_color, restart_button, border_radius=8)
         
-        restart_text = self.small_font.render("Play Again", True, (255, 255, 255))
+        restart_text = self.render_text(self.small_font, "Play Again", (255, 255, 255))
         self.screen.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, HEIGHT//2 + 30 + (50 - restart_text.get_height())//2))
         
         # Draw exit button with hover effect
@@ -232,7 +494,7 @@ class GameRenderer:
         else:
             pygame.draw.rect(self.screen, exit_button_color, exit_button, border_radius=8)
         
-        exit_text = self.small_font.render("Exit Game", True, (255, 255, 255))
+        exit_text = self.render_text(self.small_font, "Exit Game", (255, 255, 255))
         self.screen.blit(exit_text, (WIDTH//2 - exit_text.get_width()//2, HEIGHT//2 + 90 + (50 - exit_text.get_height())//2))
         
         return restart_button, exit_button 
\ No newline at end of file
@@ -0,0 +1,45 @@
+import pygame
+from collections import OrderedDict
+
+
+class SpriteCache:
+    """Bounded LRU cache of pre-rendered surfaces.
+
+    Surfaces are converted to the display's pixel format when a display
+    mode is set, so blitting them needs no per-pixel format conversion.
+    The least recently used surface is dropped once capacity is reached.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def get(self, key):
+        """Return the cached surface for a key, or None"""
+        self.lookups += 1
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        """Store a surface, converted for fast blitting, and return it"""
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.surfaces[key] = surface
+        self.surfaces.move_to_end(key)
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0